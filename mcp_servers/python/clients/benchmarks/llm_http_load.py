@@ -0,0 +1,125 @@
+"""
+Load test for src/llm/http_client.py against a local stub completion endpoint.
+
+Compares three ways of sending the same burst of concurrent completion requests:
+  blocking  - a blocking POST per request on the event loop (what the processors did with requests.post)
+  unpooled  - a fresh aiohttp session, and so a fresh connection, per request
+  pooled    - http_client.post_json, which reuses one keep-alive session per host
+
+Run from mcp_servers/python/clients:
+
+    python benchmarks/llm_http_load.py --requests 50 --latency 0.2
+"""
+import sys
+import json
+import time
+import asyncio
+import argparse
+import threading
+import urllib.request
+from pathlib import Path
+
+import aiohttp
+from aiohttp import web
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from src.llm import http_client  # noqa: E402
+
+COMPLETION = {"choices": [{"message": {"role": "assistant", "content": "ok"}}]}
+
+
+class StubServer:
+    """Completion endpoint on its own thread and event loop, so the blocking mode can't stall it."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.connections = set()
+        self.port = None
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    async def _completions(self, request: web.Request) -> web.Response:
+        self.connections.add(id(request.transport))
+        await request.json()
+        await asyncio.sleep(self.latency)
+        return web.json_response(COMPLETION)
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", self._completions)
+        self._runner = web.AppRunner(app)
+        self._loop.run_until_complete(self._runner.setup())
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        self._loop.run_until_complete(site.start())
+        self.port = self._runner.addresses[0][1]
+        self._ready.set()
+        self._loop.run_forever()
+
+    def start(self):
+        self._thread.start()
+        self._ready.wait()
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+
+def _blocking_post(url: str, payload: dict) -> dict:
+    request = urllib.request.Request(url, data=json.dumps(payload).encode(), headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())
+
+
+async def run_blocking(url: str, payload: dict, count: int):
+    async def one():
+        return _blocking_post(url, payload)
+    await asyncio.gather(*(one() for _ in range(count)))
+
+
+async def run_unpooled(url: str, payload: dict, count: int):
+    async def one():
+        async with aiohttp.ClientSession() as session:
+            async with session.post(url, json=payload) as response:
+                return await response.json()
+    await asyncio.gather(*(one() for _ in range(count)))
+
+
+async def run_pooled(url: str, payload: dict, count: int):
+    await asyncio.gather(*(http_client.post_json(url, {}, payload) for _ in range(count)))
+
+
+async def main(args):
+    stub = StubServer(args.latency)
+    stub.start()
+    url = f"http://127.0.0.1:{stub.port}/v1/chat/completions"
+    payload = {"model": "stub", "messages": [{"role": "user", "content": "x" * args.payload_bytes}]}
+    connections = stub.connections
+
+    modes = {"blocking": run_blocking, "unpooled": run_unpooled, "pooled": run_pooled}
+    print(f"{args.requests} concurrent requests x {args.rounds} rounds, {args.latency}s server latency")
+    print(f"{'mode':<10}{'seconds':>10}{'req/s':>10}{'connections':>14}")
+    try:
+        for mode in args.modes:
+            connections.clear()
+            start = time.perf_counter()
+            for _ in range(args.rounds):
+                await modes[mode](url, payload, args.requests)
+            elapsed = time.perf_counter() - start
+            total = args.requests * args.rounds
+            print(f"{mode:<10}{elapsed:>10.2f}{total / elapsed:>10.1f}{len(connections):>14}")
+    finally:
+        await http_client.close_all_sessions()
+        stub.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20, help="Concurrent requests per round")
+    parser.add_argument("--rounds", type=int, default=3, help="Bursts sent one after another")
+    parser.add_argument("--latency", type=float, default=0.5, help="Seconds the stub waits before answering")
+    parser.add_argument("--payload-bytes", type=int, default=4096, help="Size of the prompt in each request")
+    parser.add_argument("--modes", nargs="+", choices=["blocking", "unpooled", "pooled"], default=["blocking", "unpooled", "pooled"])
+    asyncio.run(main(parser.parse_args()))
@@ -12,6 +12,7 @@ from hypercorn.asyncio import serve
 from hypercorn.config import Config
 from contextlib import AsyncExitStack
 from src.llm.azureopenai import azure_openai_processor
+from src.llm.http_client import close_all_sessions
 from src.server_connection import initialize_all_mcp, MCPServers
 from src.client_and_server_validation import client_and_server_validation
 from src.client_and_server_execution import client_and_server_execution
@@ -280,6 +281,7 @@ async def shutdown():
         await app.mcp_exit_stack.__aexit__(None, None, None)
         app.mcp_exit_stack = None
         print("\n✅ MCP servers cleaned up on shutdown.\n")
+    await close_all_sessions()
     
 if __name__ == "__main__":
     # Create a config instance
@@ -6,6 +6,7 @@ ClientsConfig =[
 ServersConfig = [
 	{
 		"server_name": "MYSQL_MCP_SERVER",
+		"pool_size": 2,
 		"command":"uv",
 		"args": [
 			"--directory",
@@ -36,6 +37,7 @@ ServersConfig = [
 	},
 	{
 		"server_name": "PANDAS_MCP_SERVER",
+		"pool_size": 2,
 		"command": "uv",
 		"args": [
 			"--directory",
@@ -55,3 +57,27 @@ ServersConfig = [
 		]
 	}
 ]
+
+HttpClientConfig = {
+	"connect_timeout": 10,
+	"read_timeout": 60,
+	"total_timeout": 120,
+	"max_connections_per_host": 32,
+	"keepalive_timeout": 60
+}
+
+ToolCatalogConfig = {
+	"ttl_seconds": 300
+}
+
+MCPPoolConfig = {
+	"pool_size": 1,
+	"health_check_interval": 30,
+	"ping_timeout": 10,
+	"shutdown_timeout": 5,
+	"startup_timeout": 60
+}
+
+ToolCallConfig = {
+	"max_concurrent_tool_calls": 4
+}
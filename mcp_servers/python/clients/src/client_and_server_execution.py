@@ -1,12 +1,11 @@
 import json
+import asyncio
 import logging
 from typing import Any, Dict, List, Optional
 
-# Assuming these are your imported modules/classes for MCP clients and Azure LLM calls
-from src.llm.azureopenai import azure_openai_processor  # your async LLM call function
-from src.llm.openai import openai_processor  # your async LLM call function
+from src.llm.provider_adapters import ProviderAdapters, ProviderAdapter, LlmTurn
 from src.server_connection import MCPServers  # MCP clients dict or class with call_tool method
-from src.llm.gemini import gemini_processor 
+from src.client_and_server_config import ToolCallConfig
 
 
 class ClientAndServerExecutionResponse:
@@ -36,6 +35,11 @@ async def client_and_server_execution(payload: Dict[str, Any], streaming_callbac
         selected_servers = payload.get("selected_servers", [])
         selected_server = selected_servers[0] if selected_servers else ""
 
+        adapter = ProviderAdapters.get(selected_client)
+        if adapter is None:
+            result.Error = f"Unsupported client: {selected_client}"
+            return result
+
         # Prepare chat history
         input_content = client_details.get("input", "")
         if "chat_history" in client_details:
@@ -69,791 +73,54 @@ async def client_and_server_execution(payload: Dict[str, Any], streaming_callbac
         client_details["prompt"] = tools_getting_agent_prompt
         client_details["tools"] = []
 
-        if selected_client == "MCP_CLIENT_AZURE_AI":
-
-            # Initial LLM call
-            initial_llm_response = await azure_openai_processor(client_details)
-            if not initial_llm_response.Status:
-                result.Error = initial_llm_response.Error
-                result.Status = initial_llm_response.Status
+        # Initial LLM call
+        initial_turn = await adapter.complete(client_details)
+        if not initial_turn.Status:
+            result.Error = initial_turn.Error
+            result.Status = initial_turn.Status
+            return result
+        extracted_result = extract_data_from_response((initial_turn.Data.get("messages") or [""])[0])
+
+        record_llm_call(result, initial_turn)
+        await send_stream_event(streaming_callback, "Optimized Token LLM call Successfully Completed", "NOTIFICATION")
+
+        if not extracted_result["isFunctionCall"]:
+            # No function call, normal response case
+            client_details["prompt"] = f"{temp_prompt}. Available tools: {json.dumps(tool_call_details_arr)}"
+            client_details["tools"] = []
+
+            normal_turn = await adapter.complete(client_details)
+            if not normal_turn.Status:
+                result.Error = normal_turn.Error
+                result.Status = normal_turn.Status
                 return result
-            extracted_result = extract_data_from_response(initial_llm_response.Data.get("messages", [{}])[0] if initial_llm_response.Data else "")
-            
-            result.Data["total_llm_calls"] += 1
-            result.Data["total_tokens"] += initial_llm_response.Data.get("total_tokens", 0)
-            result.Data["total_input_tokens"] += initial_llm_response.Data.get("total_input_tokens", 0)
-            result.Data["total_output_tokens"] += initial_llm_response.Data.get("total_output_tokens", 0)
-            result.Data["final_llm_response"] = initial_llm_response.Data.get("final_llm_response")
-            result.Data["llm_responses_arr"].append(initial_llm_response.Data.get("final_llm_response"))
-
-            if streaming_callback and streaming_callback.get("is_stream"):
-                await streaming_callback["streamCallbacks"].on_data(json.dumps({
-                    "Data": "Optimized Token LLM call Successfully Completed",
-                    "Error": None,
-                    "Status": True,
-                    "StreamingStatus": "IN-PROGRESS",
-                    "Action": "NOTIFICATION"
-                }))
-            
-            if extracted_result["isFunctionCall"]:
-                final_tool_calls = []
-                selected_tools = extracted_result["selectedTools"]
-                parsed_tools = json.loads(temp_tools)
-
-                for tool_name in selected_tools:
-                    matching_tool = next((t for t in parsed_tools if t.get("function", {}).get("name") == tool_name), None)
-                    if matching_tool:
-                        final_tool_calls.append(matching_tool)
-
-                client_details["prompt"] = temp_prompt
-                client_details["tools"] = final_tool_calls
-                
-
-                # Loop to handle multiple LLM calls and tool executions
-                while True:
-                    response = await azure_openai_processor(client_details)
-                    if not response.Status:
-                        result.Error = response.Error
-                        result.Status = response.Status
-                        return result
-
-                    result.Data["total_llm_calls"] += 1
-                    result.Data["total_tokens"] += response.Data.get("total_tokens", 0)
-                    result.Data["total_input_tokens"] += response.Data.get("total_input_tokens", 0)
-                    result.Data["total_output_tokens"] += response.Data.get("total_output_tokens", 0)
-                    result.Data["final_llm_response"] = response.Data.get("final_llm_response")
-                    result.Data["llm_responses_arr"].append(response.Data.get("final_llm_response"))
-
-                    if response.Data.get("output_type") == "text":
-                        result.Data["messages"].extend(response.Data.get("messages", []))
-                        result.Data["output_type"] = response.Data.get("output_type", "")
-                        result.Error = response.Error
-                        result.Status = response.Status
-
-                        for message in response.Data.get("messages", []):
-                            if streaming_callback and streaming_callback.get("is_stream"):
-                                await streaming_callback["streamCallbacks"].on_data(json.dumps({
-                                    "Data": message,
-                                    "Error": None,
-                                    "Status": True,
-                                    "StreamingStatus": "IN-PROGRESS",
-                                    "Action": "MESSAGE"
-                                }))
-                        return result
-
-                    if streaming_callback and streaming_callback.get("is_stream"):
-                        await streaming_callback["streamCallbacks"].on_data(json.dumps({
-                            "Data": "Tool Calls Started",
-                            "Error": None,
-                            "Status": True,
-                            "StreamingStatus": "IN-PROGRESS",
-                            "Action": "NOTIFICATION"
-                        }))
-
-                    for tool in response.Data.get("final_llm_response", {}).get("choices", [{}])[0].get("message", {}).get("tool_calls", []):
-                        
-                        tool_name = tool.get("function", {}).get("name")
-                        args = json.loads(tool.get("function", {}).get("arguments", "{}"))
-
-
-                        if streaming_callback and streaming_callback.get("is_stream"):
-                            await streaming_callback["streamCallbacks"].on_data(json.dumps({
-                                "Data": f"{selected_server} MCP server {tool_name} call initiated",
-                                "Error": None,
-                                "Status": True,
-                                "StreamingStatus": "IN-PROGRESS",
-                                "Action": "NOTIFICATION"
-                            }))
-
-                        tool_call_result = await call_and_execute_tool(selected_server, selected_server_credentials, tool_name, args)
-
-                        if streaming_callback and streaming_callback.get("is_stream"):
-                            await streaming_callback["streamCallbacks"].on_data(json.dumps({
-                                "Data": f"{selected_server} MCP server {tool_name} call result  : {json.dumps(tool_call_result)}",
-                                "Error": None,
-                                "Status": True,
-                                "StreamingStatus": "IN-PROGRESS",
-                                "Action": "NOTIFICATION"
-                            }))
-
-                        result.Data["executed_tool_calls"].append({
-                            "id": tool.get("id"),
-                            "name": tool_name,
-                            "arguments": args,
-                            "result": tool_call_result,
-                        })
-
-                        tool_call_content_data = f"Executed tool: {tool_name} and the result is: {json.dumps(tool_call_result)}"
-                        client_details["chat_history"].append({
-                            "role": "assistant",
-                            "content": tool_call_content_data,
-                        })
-
-            else:
-                # No function call, normal response case
-                client_details["prompt"] = f"{temp_prompt}. Available tools: {json.dumps(tool_call_details_arr)}"
-                client_details["tools"] = []
-
-                normal_response = await azure_openai_processor(client_details)
-                result.Data["total_llm_calls"] += 1
-                result.Data["total_tokens"] += normal_response.Data.get("total_tokens", 0)
-                result.Data["total_input_tokens"] += normal_response.Data.get("total_input_tokens", 0)
-                result.Data["total_output_tokens"] += normal_response.Data.get("total_output_tokens", 0)
-                result.Data["final_llm_response"] = normal_response.Data.get("final_llm_response")
-                result.Data["llm_responses_arr"].append(normal_response.Data.get("final_llm_response"))
-
-                result.Data["output_type"] = normal_response.Data.get("output_type", "")
-                result.Error = normal_response.Error
-                result.Status = normal_response.Status
-
-                content = normal_response.Data.get("final_llm_response", {}).get("choices", [{}])[0].get("message", {}).get("content")
-                if not normal_response.Status or (content is not None and content != ""):
-                    result.Data["messages"] = normal_response.Data.get("messages", [])
-                    for message in normal_response.Data.get("messages", []):
-                        if streaming_callback and streaming_callback.get("is_stream"):
-                            await streaming_callback["streamCallbacks"].on_data(json.dumps({
-                                "Data": message,
-                                "Error": None,
-                                "Status": True,
-                                "StreamingStatus": "IN-PROGRESS",
-                                "Action": "MESSAGE"
-                            }))
-                    return result
-
-                if len(normal_response.Data.get("final_llm_response", {}).get("choices", [{}])[0].get("message", {}).get("tool_calls", [])) > 0:
-                    # Repeat the tool calling loop as in the TS code
-                    final_tool_calls = []
-                    selected_tools = extracted_result["selectedTools"]
-                    parsed_tools = json.loads(temp_tools)
-                    for tool_name in selected_tools:
-                        matching_tool = next((t for t in parsed_tools if t.get("function", {}).get("name") == tool_name), None)
-                        if matching_tool:
-                            final_tool_calls.append(matching_tool)
-
-                    client_details["prompt"] = temp_prompt
-                    client_details["tools"] = final_tool_calls
-
-                    while True:
-                        response = await azure_openai_processor(client_details)
-                        if not response.Status:
-                            result.Error = response.Error
-                            result.Status = response.Status
-                            return result
-
-                        result.Data["total_llm_calls"] += 1
-                        result.Data["total_tokens"] += response.Data.get("total_tokens", 0)
-                        result.Data["total_input_tokens"] += response.Data.get("total_input_tokens", 0)
-                        result.Data["total_output_tokens"] += response.Data.get("total_output_tokens", 0)
-                        result.Data["final_llm_response"] = response.Data.get("final_llm_response")
-                        result.Data["llm_responses_arr"].append(response.Data.get("final_llm_response"))
-
-                        if response.Data.get("output_type") == "text":
-                            result.Data["messages"].extend(response.Data.get("messages", []))
-                            result.Data["output_type"] = response.Data.get("output_type", "")
-                            result.Error = response.Error
-                            result.Status = response.Status
-
-                            for message in response.Data.get("messages", []):
-                                if streaming_callback and streaming_callback.get("is_stream"):
-                                    await streaming_callback["streamCallbacks"].on_data(json.dumps({
-                                        "Data": message,
-                                        "Error": None,
-                                        "Status": True,
-                                        "StreamingStatus": "IN-PROGRESS",
-                                        "Action": "MESSAGE"
-                                    }))
-                            return result
-
-                        if streaming_callback and streaming_callback.get("is_stream"):
-                            await streaming_callback["streamCallbacks"].on_data(json.dumps({
-                                "Data": "Tool Calls Started",
-                                "Error": None,
-                                "Status": True,
-                                "StreamingStatus": "IN-PROGRESS",
-                                "Action": "NOTIFICATION"
-                            }))
-
-                        for tool in response.Data.get("final_llm_response", {}).get("choices", [{}])[0].get("message", {}).get("tool_calls", []):
-                            tool_name = tool.get("function", {}).get("name")
-                            args = json.loads(tool.get("function", {}).get("arguments", "{}"))
-
-                            if streaming_callback and streaming_callback.get("is_stream"):
-                                await streaming_callback["streamCallbacks"].on_data(json.dumps({
-                                    "Data": f"{selected_server} MCP server {tool_name} call initiated",
-                                    "Error": None,
-                                    "Status": True,
-                                    "StreamingStatus": "IN-PROGRESS",
-                                    "Action": "NOTIFICATION"
-                                }))
-
-                            tool_call_result = await call_and_execute_tool(selected_server, selected_server_credentials, tool_name, args)
-
-                            if streaming_callback and streaming_callback.get("is_stream"):
-                                await streaming_callback["streamCallbacks"].on_data(json.dumps({
-                                    "Data": f"{selected_server} MCP server {tool_name} call result  : {json.dumps(tool_call_result)}",
-                                    "Error": None,
-                                    "Status": True,
-                                    "StreamingStatus": "IN-PROGRESS",
-                                    "Action": "NOTIFICATION"
-                                }))
-
-                            result.Data["executed_tool_calls"].append({
-                                "id": tool.get("id"),
-                                "name": tool_name,
-                                "arguments": args,
-                                "result": tool_call_result,
-                            })
-
-                            tool_call_content_data = f"Executed tool: {tool_name} and the result is: {json.dumps(tool_call_result)}"
-                            client_details["chat_history"].append({
-                                "role": "assistant",
-                                "content": tool_call_content_data,
-                            })
-        
-        elif selected_client == "MCP_CLIENT_OPENAI":
 
-            # Initial LLM call
-            initial_llm_response = await openai_processor(client_details)
-            if not initial_llm_response.Status:
-                result.Error = initial_llm_response.Error
-                result.Status = initial_llm_response.Status
+            record_llm_call(result, normal_turn)
+            result.Data["output_type"] = normal_turn.Data.get("output_type", "")
+            result.Error = normal_turn.Error
+            result.Status = normal_turn.Status
+
+            if normal_turn.content:
+                result.Data["messages"] = normal_turn.Data.get("messages", [])
+                for message in result.Data["messages"]:
+                    await send_stream_event(streaming_callback, message, "MESSAGE")
                 return result
-            extracted_result = extract_data_from_response(initial_llm_response.Data.get("messages", [{}])[0] if initial_llm_response.Data else "")
-            
-            result.Data["total_llm_calls"] += 1
-            result.Data["total_tokens"] += initial_llm_response.Data.get("total_tokens", 0)
-            result.Data["total_input_tokens"] += initial_llm_response.Data.get("total_input_tokens", 0)
-            result.Data["total_output_tokens"] += initial_llm_response.Data.get("total_output_tokens", 0)
-            result.Data["final_llm_response"] = initial_llm_response.Data.get("final_llm_response")
-            result.Data["llm_responses_arr"].append(initial_llm_response.Data.get("final_llm_response"))
-
-            if streaming_callback and streaming_callback.get("is_stream"):
-                await streaming_callback["streamCallbacks"].on_data(json.dumps({
-                    "Data": "Optimized Token LLM call Successfully Completed",
-                    "Error": None,
-                    "Status": True,
-                    "StreamingStatus": "IN-PROGRESS",
-                    "Action": "NOTIFICATION"
-                }))
-            
-            if extracted_result["isFunctionCall"]:
-                final_tool_calls = []
-                selected_tools = extracted_result["selectedTools"]
-                parsed_tools = json.loads(temp_tools)
-
-                for tool_name in selected_tools:
-                    matching_tool = next((t for t in parsed_tools if t.get("function", {}).get("name") == tool_name), None)
-                    if matching_tool:
-                        final_tool_calls.append(matching_tool)
-
-                client_details["prompt"] = temp_prompt
-                client_details["tools"] = final_tool_calls
-                
-
-                # Loop to handle multiple LLM calls and tool executions
-                while True:
-                    response = await openai_processor(client_details)
-                    if not response.Status:
-                        result.Error = response.Error
-                        result.Status = response.Status
-                        return result
-
-                    result.Data["total_llm_calls"] += 1
-                    result.Data["total_tokens"] += response.Data.get("total_tokens", 0)
-                    result.Data["total_input_tokens"] += response.Data.get("total_input_tokens", 0)
-                    result.Data["total_output_tokens"] += response.Data.get("total_output_tokens", 0)
-                    result.Data["final_llm_response"] = response.Data.get("final_llm_response")
-                    result.Data["llm_responses_arr"].append(response.Data.get("final_llm_response"))
-
-                    if response.Data.get("output_type") == "text":
-                        result.Data["messages"].extend(response.Data.get("messages", []))
-                        result.Data["output_type"] = response.Data.get("output_type", "")
-                        result.Error = response.Error
-                        result.Status = response.Status
-
-                        for message in response.Data.get("messages", []):
-                            if streaming_callback and streaming_callback.get("is_stream"):
-                                await streaming_callback["streamCallbacks"].on_data(json.dumps({
-                                    "Data": message,
-                                    "Error": None,
-                                    "Status": True,
-                                    "StreamingStatus": "IN-PROGRESS",
-                                    "Action": "MESSAGE"
-                                }))
-                        return result
-
-                    if streaming_callback and streaming_callback.get("is_stream"):
-                        await streaming_callback["streamCallbacks"].on_data(json.dumps({
-                            "Data": "Tool Calls Started",
-                            "Error": None,
-                            "Status": True,
-                            "StreamingStatus": "IN-PROGRESS",
-                            "Action": "NOTIFICATION"
-                        }))
-
-                    for tool in response.Data.get("final_llm_response", {}).get("choices", [{}])[0].get("message", {}).get("tool_calls", []):
-                        
-                        tool_name = tool.get("function", {}).get("name")
-                        args = json.loads(tool.get("function", {}).get("arguments", "{}"))
-
-
-                        if streaming_callback and streaming_callback.get("is_stream"):
-                            await streaming_callback["streamCallbacks"].on_data(json.dumps({
-                                "Data": f"{selected_server} MCP server {tool_name} call initiated",
-                                "Error": None,
-                                "Status": True,
-                                "StreamingStatus": "IN-PROGRESS",
-                                "Action": "NOTIFICATION"
-                            }))
-
-                        tool_call_result = await call_and_execute_tool(selected_server, selected_server_credentials, tool_name, args)
-
-                        if streaming_callback and streaming_callback.get("is_stream"):
-                            await streaming_callback["streamCallbacks"].on_data(json.dumps({
-                                "Data": f"{selected_server} MCP server {tool_name} call result  : {json.dumps(tool_call_result)}",
-                                "Error": None,
-                                "Status": True,
-                                "StreamingStatus": "IN-PROGRESS",
-                                "Action": "NOTIFICATION"
-                            }))
-
-                        result.Data["executed_tool_calls"].append({
-                            "id": tool.get("id"),
-                            "name": tool_name,
-                            "arguments": args,
-                            "result": tool_call_result,
-                        })
-
-                        tool_call_content_data = f"Executed tool: {tool_name} and the result is: {json.dumps(tool_call_result)}"
-                        client_details["chat_history"].append({
-                            "role": "assistant",
-                            "content": tool_call_content_data,
-                        })
-
-            else:
-                # No function call, normal response case
-                client_details["prompt"] = f"{temp_prompt}. Available tools: {json.dumps(tool_call_details_arr)}"
-                client_details["tools"] = []
-
-                normal_response = await openai_processor(client_details)
-                result.Data["total_llm_calls"] += 1
-                result.Data["total_tokens"] += normal_response.Data.get("total_tokens", 0)
-                result.Data["total_input_tokens"] += normal_response.Data.get("total_input_tokens", 0)
-                result.Data["total_output_tokens"] += normal_response.Data.get("total_output_tokens", 0)
-                result.Data["final_llm_response"] = normal_response.Data.get("final_llm_response")
-                result.Data["llm_responses_arr"].append(normal_response.Data.get("final_llm_response"))
-
-                result.Data["output_type"] = normal_response.Data.get("output_type", "")
-                result.Error = normal_response.Error
-                result.Status = normal_response.Status
-
-                content = normal_response.Data.get("final_llm_response", {}).get("choices", [{}])[0].get("message", {}).get("content")
-                if not normal_response.Status or (content is not None and content != ""):
-                    result.Data["messages"] = normal_response.Data.get("messages", [])
-                    for message in normal_response.Data.get("messages", []):
-                        if streaming_callback and streaming_callback.get("is_stream"):
-                            await streaming_callback["streamCallbacks"].on_data(json.dumps({
-                                "Data": message,
-                                "Error": None,
-                                "Status": True,
-                                "StreamingStatus": "IN-PROGRESS",
-                                "Action": "MESSAGE"
-                            }))
-                    return result
-
-                if len(normal_response.Data.get("final_llm_response", {}).get("choices", [{}])[0].get("message", {}).get("tool_calls", [])) > 0:
-                    # Repeat the tool calling loop as in the TS code
-                    final_tool_calls = []
-                    selected_tools = extracted_result["selectedTools"]
-                    parsed_tools = json.loads(temp_tools)
-                    for tool_name in selected_tools:
-                        matching_tool = next((t for t in parsed_tools if t.get("function", {}).get("name") == tool_name), None)
-                        if matching_tool:
-                            final_tool_calls.append(matching_tool)
-
-                    client_details["prompt"] = temp_prompt
-                    client_details["tools"] = final_tool_calls
-
-                    while True:
-                        response = await openai_processor(client_details)
-                        if not response.Status:
-                            result.Error = response.Error
-                            result.Status = response.Status
-                            return result
-
-                        result.Data["total_llm_calls"] += 1
-                        result.Data["total_tokens"] += response.Data.get("total_tokens", 0)
-                        result.Data["total_input_tokens"] += response.Data.get("total_input_tokens", 0)
-                        result.Data["total_output_tokens"] += response.Data.get("total_output_tokens", 0)
-                        result.Data["final_llm_response"] = response.Data.get("final_llm_response")
-                        result.Data["llm_responses_arr"].append(response.Data.get("final_llm_response"))
-
-                        if response.Data.get("output_type") == "text":
-                            result.Data["messages"].extend(response.Data.get("messages", []))
-                            result.Data["output_type"] = response.Data.get("output_type", "")
-                            result.Error = response.Error
-                            result.Status = response.Status
-
-                            for message in response.Data.get("messages", []):
-                                if streaming_callback and streaming_callback.get("is_stream"):
-                                    await streaming_callback["streamCallbacks"].on_data(json.dumps({
-                                        "Data": message,
-                                        "Error": None,
-                                        "Status": True,
-                                        "StreamingStatus": "IN-PROGRESS",
-                                        "Action": "MESSAGE"
-                                    }))
-                            return result
-
-                        if streaming_callback and streaming_callback.get("is_stream"):
-                            await streaming_callback["streamCallbacks"].on_data(json.dumps({
-                                "Data": "Tool Calls Started",
-                                "Error": None,
-                                "Status": True,
-                                "StreamingStatus": "IN-PROGRESS",
-                                "Action": "NOTIFICATION"
-                            }))
-
-                        for tool in response.Data.get("final_llm_response", {}).get("choices", [{}])[0].get("message", {}).get("tool_calls", []):
-                            tool_name = tool.get("function", {}).get("name")
-                            args = json.loads(tool.get("function", {}).get("arguments", "{}"))
-
-                            if streaming_callback and streaming_callback.get("is_stream"):
-                                await streaming_callback["streamCallbacks"].on_data(json.dumps({
-                                    "Data": f"{selected_server} MCP server {tool_name} call initiated",
-                                    "Error": None,
-                                    "Status": True,
-                                    "StreamingStatus": "IN-PROGRESS",
-                                    "Action": "NOTIFICATION"
-                                }))
-
-                            tool_call_result = await call_and_execute_tool(selected_server, selected_server_credentials, tool_name, args)
-
-                            if streaming_callback and streaming_callback.get("is_stream"):
-                                await streaming_callback["streamCallbacks"].on_data(json.dumps({
-                                    "Data": f"{selected_server} MCP server {tool_name} call result  : {json.dumps(tool_call_result)}",
-                                    "Error": None,
-                                    "Status": True,
-                                    "StreamingStatus": "IN-PROGRESS",
-                                    "Action": "NOTIFICATION"
-                                }))
-
-                            result.Data["executed_tool_calls"].append({
-                                "id": tool.get("id"),
-                                "name": tool_name,
-                                "arguments": args,
-                                "result": tool_call_result,
-                            })
-
-                            tool_call_content_data = f"Executed tool: {tool_name} and the result is: {json.dumps(tool_call_result)}"
-                            client_details["chat_history"].append({
-                                "role": "assistant",
-                                "content": tool_call_content_data,
-                            })
-        
-        elif selected_client == "MCP_CLIENT_GEMINI":
-
-            # Initial LLM call
-            initial_llm_response = await gemini_processor(client_details)
-            print("Initial LLM response:", initial_llm_response)
-            if not initial_llm_response.Status:
-                result.Error = initial_llm_response.Error
-                result.Status = initial_llm_response.Status
+
+            if not normal_turn.tool_calls:
                 return result
-            extracted_result = extract_data_from_response(initial_llm_response.Data.get("messages", [{}])[0] if initial_llm_response.Data else "")
-            
-            result.Data["total_llm_calls"] += 1
-            result.Data["total_tokens"] += initial_llm_response.Data.get("total_tokens", 0)
-            result.Data["total_input_tokens"] += initial_llm_response.Data.get("total_input_tokens", 0)
-            result.Data["total_output_tokens"] += initial_llm_response.Data.get("total_output_tokens", 0)
-            result.Data["final_llm_response"] = initial_llm_response.Data.get("final_llm_response")
-            result.Data["llm_responses_arr"].append(initial_llm_response.Data.get("final_llm_response"))
-
-            if streaming_callback and streaming_callback.get("is_stream"):
-                await streaming_callback["streamCallbacks"].on_data(json.dumps({
-                    "Data": "Optimized Token LLM call Successfully Completed",
-                    "Error": None,
-                    "Status": True,
-                    "StreamingStatus": "IN-PROGRESS",
-                    "Action": "NOTIFICATION"
-                }))
-            
-            if extracted_result["isFunctionCall"]:
-                final_tool_calls = []
-                selected_tools = extracted_result["selectedTools"]
-                parsed_tools = json.loads(temp_tools)
-
-                for tool_name in selected_tools:
-                    matching_tool = next((t for t in parsed_tools if t.get("function", {}).get("name") == tool_name), None)
-                    if matching_tool:
-                        final_tool_calls.append(matching_tool)
-
-                client_details["prompt"] = temp_prompt
-                client_details["tools"] = final_tool_calls
-             
-
-                # Loop to handle multiple LLM calls and tool executions
-                count=1
-                while True:
-                    if count==3:
-                        result.Error = "Maximum LLM calls went into halucination"
-                        result.Status = response.Status
-                        return result
-                    
-                    if count != 1:
-                         client_details["tools"] = []
-                    
-                    response = await gemini_processor(client_details)
-                    print(response)
-                    if not response.Status:
-                        result.Error = response.Error
-                        result.Status = response.Status
-                        return result
-
-                    result.Data["total_llm_calls"] += 1
-                    result.Data["total_tokens"] += response.Data.get("total_tokens", 0)
-                    result.Data["total_input_tokens"] += response.Data.get("total_input_tokens", 0)
-                    result.Data["total_output_tokens"] += response.Data.get("total_output_tokens", 0)
-                    result.Data["final_llm_response"] = response.Data.get("final_llm_response")
-                    result.Data["llm_responses_arr"].append(response.Data.get("final_llm_response"))
-
-                    if response.Data.get("output_type") == "text":
-                        result.Data["messages"].extend(response.Data.get("messages", []))
-                        result.Data["output_type"] = response.Data.get("output_type", "")
-                        result.Error = response.Error
-                        result.Status = response.Status
-
-                        for message in response.Data.get("messages", []):
-                            if streaming_callback and streaming_callback.get("is_stream"):
-                                await streaming_callback["streamCallbacks"].on_data(json.dumps({
-                                    "Data": message,
-                                    "Error": None,
-                                    "Status": True,
-                                    "StreamingStatus": "IN-PROGRESS",
-                                    "Action": "MESSAGE"
-                                }))
-                        return result
-
-                    if streaming_callback and streaming_callback.get("is_stream"):
-                        await streaming_callback["streamCallbacks"].on_data(json.dumps({
-                            "Data": "Tool Calls Started",
-                            "Error": None,
-                            "Status": True,
-                            "StreamingStatus": "IN-PROGRESS",
-                            "Action": "NOTIFICATION"
-                        }))
-
-                    final_llm_response = response.Data.get("final_llm_response") if response.Data else None
-                    candidates = final_llm_response.get("candidates", []) if final_llm_response else []
-                    first_candidate = candidates[0] if candidates and len(candidates) > 0 else {}
-                    content = first_candidate.get("content", {}) if isinstance(first_candidate, dict) else {}
-                    parts = content.get("parts", []) if isinstance(content, dict) else []
-
-                    for tool in parts:
-
-                        tool_name = tool.get("functionCall", {}).get("name")
-                        args_raw = tool.get("functionCall", {}).get("args", {})
-
-                        if isinstance(args_raw, str):
-                            try:
-                                 args = json.loads(args_raw)
-                            except json.JSONDecodeError as e:
-                                 args = {}
-                        else:
-                            args = args_raw
-
-                        if streaming_callback and streaming_callback.get("is_stream"):
-                            await streaming_callback["streamCallbacks"].on_data(json.dumps({
-                                "Data": f"{selected_server} MCP server {tool_name} call initiated",
-                                "Error": None,
-                                "Status": True,
-                                "StreamingStatus": "IN-PROGRESS",
-                                "Action": "NOTIFICATION"
-                            }))
-
-                        tool_call_result = await call_and_execute_tool(selected_server, selected_server_credentials, tool_name, args)
-
-                        if streaming_callback and streaming_callback.get("is_stream"):
-                            await streaming_callback["streamCallbacks"].on_data(json.dumps({
-                                "Data": f"{selected_server} MCP server {tool_name} call result  : {json.dumps(tool_call_result)}",
-                                "Error": None,
-                                "Status": True,
-                                "StreamingStatus": "IN-PROGRESS",
-                                "Action": "NOTIFICATION"
-                            }))
-
-
-                        result.Data["executed_tool_calls"].append({
-                            "id": tool.get("id"),
-                            "name": tool_name,
-                            "arguments": args,
-                            "result": tool_call_result,
-                        })
-
-                        tool_call_content_data = f"Executed tool: {tool_name} and the result is: {json.dumps(tool_call_result)}"
-                        client_details["chat_history"].append({
-                            "role": "model",
-                            "content": tool_call_content_data,
-                        })
-
-                    count+=1
-            else:
-                # No function call, normal response case
-                client_details["prompt"] = f"{temp_prompt}. Available tools: {json.dumps(tool_call_details_arr)}"
-                client_details["tools"] = []
-
-                normal_response = await gemini_processor(client_details)
-                result.Data["total_llm_calls"] += 1
-                result.Data["total_tokens"] += normal_response.Data.get("total_tokens", 0)
-                result.Data["total_input_tokens"] += normal_response.Data.get("total_input_tokens", 0)
-                result.Data["total_output_tokens"] += normal_response.Data.get("total_output_tokens", 0)
-                result.Data["final_llm_response"] = normal_response.Data.get("final_llm_response")
-                result.Data["llm_responses_arr"].append(normal_response.Data.get("final_llm_response"))
-
-                result.Data["output_type"] = normal_response.Data.get("output_type", "")
-                result.Error = normal_response.Error
-                result.Status = normal_response.Status
-
-                final_llm_response = normal_response.Data.get("final_llm_response") if normal_response.Data else None
-                candidates = final_llm_response.get("candidates", []) if final_llm_response else []
-                first_candidate = candidates[0] if candidates and len(candidates) > 0 else {}
-                content = first_candidate.get("content", {}) if isinstance(first_candidate, dict) else {}
-                parts = content.get("parts", []) if isinstance(content, dict) else []
-
-                text_content = content.get("text")
-
-                if not normal_response.Status or (text_content is not None and text_content != ""):
-                    result.Data["messages"] = normal_response.Data.get("messages", [])
-                    for message in normal_response.Data.get("messages", []):
-                        if streaming_callback and streaming_callback.get("is_stream"):
-                            await streaming_callback["streamCallbacks"].on_data(json.dumps({
-                                "Data": message,
-                                "Error": None,
-                                "Status": True,
-                                "StreamingStatus": "IN-PROGRESS",
-                                "Action": "MESSAGE"
-                            }))
-                    return result
-
-                if len(parts) > 0:
-                    # Repeat the tool calling loop as in the TS code
-                    final_tool_calls = []
-                    selected_tools = extracted_result["selectedTools"]
-                    parsed_tools = json.loads(temp_tools)
-                    for tool_name in selected_tools:
-                        matching_tool = next((t for t in parsed_tools if t.get("function", {}).get("name") == tool_name), None)
-                        if matching_tool:
-                            final_tool_calls.append(matching_tool)
-
-                    client_details["prompt"] = temp_prompt
-                    client_details["tools"] = final_tool_calls
-
-                    count=1
-                    while True:
-                        if count==3:
-                            result.Error = "Maximum LLM calls went into halucination"
-                            result.Status = False
-                            return result
-                    
-                        if count != 1:
-                            client_details["tools"] = []
-
-                        response = await gemini_processor(client_details)
-                        if not response.Status:
-                            result.Error = response.Error
-                            result.Status = response.Status
-                            return result
-
-                        result.Data["total_llm_calls"] += 1
-                        result.Data["total_tokens"] += response.Data.get("total_tokens", 0)
-                        result.Data["total_input_tokens"] += response.Data.get("total_input_tokens", 0)
-                        result.Data["total_output_tokens"] += response.Data.get("total_output_tokens", 0)
-                        result.Data["final_llm_response"] = response.Data.get("final_llm_response")
-                        result.Data["llm_responses_arr"].append(response.Data.get("final_llm_response"))
-
-                        if response.Data.get("output_type") == "text":
-                            result.Data["messages"].extend(response.Data.get("messages", []))
-                            result.Data["output_type"] = response.Data.get("output_type", "")
-                            result.Error = response.Error
-                            result.Status = response.Status
-
-                            for message in response.Data.get("messages", []):
-                                if streaming_callback and streaming_callback.get("is_stream"):
-                                    await streaming_callback["streamCallbacks"].on_data(json.dumps({
-                                        "Data": message,
-                                        "Error": None,
-                                        "Status": True,
-                                        "StreamingStatus": "IN-PROGRESS",
-                                        "Action": "MESSAGE"
-                                    }))
-                            return result
-
-                        if streaming_callback and streaming_callback.get("is_stream"):
-                            await streaming_callback["streamCallbacks"].on_data(json.dumps({
-                                "Data": "Tool Calls Started",
-                                "Error": None,
-                                "Status": True,
-                                "StreamingStatus": "IN-PROGRESS",
-                                "Action": "NOTIFICATION"
-                            }))
-
-                        final_llm_response = response.Data.get("final_llm_response") if response.Data else None
-                        candidates = final_llm_response.get("candidates", []) if final_llm_response else []
-                        first_candidate = candidates[0] if candidates and len(candidates) > 0 else {}
-                        content = first_candidate.get("content", {}) if isinstance(first_candidate, dict) else {}
-                        parts = content.get("parts", []) if isinstance(content, dict) else []
-
-                        for tool in parts:
-
-                            tool_name = tool.get("functionCall", {}).get("name")
-                            args_raw = tool.get("functionCall", {}).get("args", {})
-
-                            if isinstance(args_raw, str):
-                                try:
-                                    args = json.loads(args_raw)
-                                except json.JSONDecodeError as e:
-                                    args = {}
-                            else:
-                                args = args_raw
-
-                            if streaming_callback and streaming_callback.get("is_stream"):
-                                await streaming_callback["streamCallbacks"].on_data(json.dumps({
-                                    "Data": f"{selected_server} MCP server {tool_name} call initiated",
-                                    "Error": None,
-                                    "Status": True,
-                                    "StreamingStatus": "IN-PROGRESS",
-                                    "Action": "NOTIFICATION"
-                                }))
-
-                            tool_call_result = await call_and_execute_tool(selected_server, selected_server_credentials, tool_name, args)
-
-                            if streaming_callback and streaming_callback.get("is_stream"):
-                                await streaming_callback["streamCallbacks"].on_data(json.dumps({
-                                    "Data": f"{selected_server} MCP server {tool_name} call result  : {json.dumps(tool_call_result)}",
-                                    "Error": None,
-                                    "Status": True,
-                                    "StreamingStatus": "IN-PROGRESS",
-                                    "Action": "NOTIFICATION"
-                                }))
-
-
-                            result.Data["executed_tool_calls"].append({
-                                "id": tool.get("id"),
-                                "name": tool_name,
-                                "arguments": args,
-                                "result": tool_call_result,
-                            })
-
-                            tool_call_content_data = f"Executed tool: {tool_name} and the result is: {json.dumps(tool_call_result)}"
-                            client_details["chat_history"].append({
-                                "role": "model",
-                                "content": tool_call_content_data,
-                            })
-
-                        count+=1    
-
-        result.Status = True
-        return result
+
+        # Narrow the tool list down to the ones picked by the initial call
+        final_tool_calls = []
+        parsed_tools = json.loads(temp_tools)
+        for tool_name in extracted_result["selectedTools"]:
+            matching_tool = next((t for t in parsed_tools if t.get("function", {}).get("name") == tool_name), None)
+            if matching_tool:
+                final_tool_calls.append(matching_tool)
+
+        client_details["prompt"] = temp_prompt
+        client_details["tools"] = final_tool_calls
+
+        return await run_tool_loop(adapter, client_details, result, selected_server, selected_server_credentials, streaming_callback)
 
     except Exception as e:
         logging.error(f"Exception in client_and_server_execution: {e}")
@@ -863,6 +130,81 @@ async def client_and_server_execution(payload: Dict[str, Any], streaming_callbac
         return res
 
 
+async def run_tool_loop(
+    adapter: ProviderAdapter,
+    client_details: Dict[str, Any],
+    result: ClientAndServerExecutionResponse,
+    selected_server: str,
+    selected_server_credentials: Any,
+    streaming_callback: Optional[Any] = None
+) -> ClientAndServerExecutionResponse:
+    """Loop LLM calls and tool executions until the model answers with text."""
+    tool_round = 1
+    while True:
+        if adapter.max_tool_rounds and tool_round > adapter.max_tool_rounds:
+            result.Error = "Maximum LLM calls went into halucination"
+            result.Status = False
+            return result
+
+        if tool_round > 1 and not adapter.keep_tools_after_first_round:
+            client_details["tools"] = []
+
+        turn = await adapter.complete(client_details)
+        if not turn.Status:
+            result.Error = turn.Error
+            result.Status = turn.Status
+            return result
+
+        record_llm_call(result, turn)
+
+        if turn.Data.get("output_type") == "text":
+            result.Data["messages"].extend(turn.Data.get("messages", []))
+            result.Data["output_type"] = turn.Data.get("output_type", "")
+            result.Error = turn.Error
+            result.Status = turn.Status
+
+            for message in turn.Data.get("messages", []):
+                await send_stream_event(streaming_callback, message, "MESSAGE")
+            return result
+
+        await send_stream_event(streaming_callback, "Tool Calls Started", "NOTIFICATION")
+
+        executed_tool_calls = await execute_tool_calls(selected_server, selected_server_credentials, turn.tool_calls, streaming_callback)
+
+        for executed_tool_call in executed_tool_calls:
+            result.Data["executed_tool_calls"].append(executed_tool_call)
+
+            tool_call_content_data = f"Executed tool: {executed_tool_call['name']} and the result is: {json.dumps(executed_tool_call['result'])}"
+            client_details["chat_history"].append({
+                "role": adapter.history_role,
+                "content": tool_call_content_data,
+            })
+
+        tool_round += 1
+
+
+def record_llm_call(result: ClientAndServerExecutionResponse, turn: LlmTurn) -> None:
+    """Accumulate call count and token usage for one LLM round trip."""
+    result.Data["total_llm_calls"] += 1
+    result.Data["total_tokens"] += turn.Data.get("total_tokens", 0)
+    result.Data["total_input_tokens"] += turn.Data.get("total_input_tokens", 0)
+    result.Data["total_output_tokens"] += turn.Data.get("total_output_tokens", 0)
+    result.Data["final_llm_response"] = turn.Data.get("final_llm_response")
+    result.Data["llm_responses_arr"].append(turn.Data.get("final_llm_response"))
+
+
+async def send_stream_event(streaming_callback: Optional[Any], data: Any, action: str) -> None:
+    """Push an IN-PROGRESS event to the stream when streaming is enabled."""
+    if streaming_callback and streaming_callback.get("is_stream"):
+        await streaming_callback["streamCallbacks"].on_data(json.dumps({
+            "Data": data,
+            "Error": None,
+            "Status": True,
+            "StreamingStatus": "IN-PROGRESS",
+            "Action": action
+        }))
+
+
 def extract_data_from_response(message: Any) -> Dict[str, Any]:
 
     """Parse message content for function call info and selected tools."""
@@ -951,4 +293,33 @@ async def call_and_execute_tool(
         # catch any call-tool exception and stringify it
         tool_call_result = str(err)
 
-    return tool_call_result
\ No newline at end of file
+    return tool_call_result
+
+
+async def execute_tool_calls(
+    selected_server: str,
+    credentials: Any,
+    tool_calls: List[Dict[str, Any]],
+    streaming_callback: Optional[Any] = None
+) -> List[Dict[str, Any]]:
+    """Run the tool calls from one LLM turn concurrently, bounded by ToolCallConfig.
+       Each call is a dict with id, name and arguments; results come back in the original order."""
+    semaphore = asyncio.Semaphore(max(1, ToolCallConfig.get("max_concurrent_tool_calls", 4)))
+
+    async def run_tool_call(tool_call: Dict[str, Any]) -> Dict[str, Any]:
+        tool_name = tool_call["name"]
+        async with semaphore:
+            await send_stream_event(streaming_callback, f"{selected_server} MCP server {tool_name} call initiated", "NOTIFICATION")
+
+            tool_call_result = await call_and_execute_tool(selected_server, credentials, tool_name, tool_call["arguments"])
+
+            await send_stream_event(streaming_callback, f"{selected_server} MCP server {tool_name} call result  : {json.dumps(tool_call_result)}", "NOTIFICATION")
+
+        return {
+            "id": tool_call.get("id"),
+            "name": tool_name,
+            "arguments": tool_call["arguments"],
+            "result": tool_call_result,
+        }
+
+    return list(await asyncio.gather(*(run_tool_call(tool_call) for tool_call in tool_calls)))
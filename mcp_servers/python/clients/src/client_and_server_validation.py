@@ -1,6 +1,6 @@
 from typing import Dict, Any, Callable, Optional
 
-from src.server_connection import MCPServers
+from src.server_connection import MCPServers, MCPStartupTimings, get_tool_catalog
 from src.client_and_server_config import ServersConfig, ClientsConfig
 
 
@@ -20,6 +20,13 @@ async def client_and_server_validation(payload: Dict[str, Any], streaming_callba
             }
 
         for server in selected_servers:
+            if server not in MCPServers and MCPStartupTimings.get(server, {}).get("status") == "starting":
+                print("Server Still Starting")
+                return {
+                    "payload": None,
+                    "error": f"Server {server} is still starting",
+                    "status": False
+                }
             if server not in MCPServers:
                 print("Invalid Server")
                 return {
@@ -38,23 +45,7 @@ async def client_and_server_validation(payload: Dict[str, Any], streaming_callba
 
         tools_arr = []
         for server in selected_servers:
-   
-            resource = await MCPServers[server].list_tools()
-            if resource:
-                for tool in resource.tools:
-                    tool_dict = {
-                        "type": "function",
-                        "function": {
-                            "name": tool.name,
-                            "description": getattr(tool, "description", f"Tool for {tool.name}"),
-                            "parameters": getattr(tool, "inputSchema", {
-                                "type": "object",
-                                "properties": {},
-                                "required": []
-                            })
-                        }
-                    }
-                    tools_arr.append(tool_dict)
+            tools_arr.extend(await get_tool_catalog(server))
 
         client_details["tools"] = tools_arr
 
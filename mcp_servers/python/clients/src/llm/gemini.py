@@ -1,8 +1,9 @@
-import requests
 import json
 from typing import Dict, List, Any, Optional, Union
 from dataclasses import dataclass, field, asdict
 
+from src.llm.http_client import post_json, LlmHttpError
+
 @dataclass
 class ChatMessage:
     role: str
@@ -143,10 +144,7 @@ async def gemini_processor(data: Dict[str, Any]) -> LlmResponseStruct:
         # Send request
         url = f"https://generativelanguage.googleapis.com/v1beta/models/{selected_model}:generateContent?key={params.api_key}"
         headers = {'Content-Type': 'application/json'}
-        response = requests.post(url, headers=headers, json=payload, timeout=60)
-        response.raise_for_status()
-
-        response_data = response.json()
+        response_data = await post_json(url, headers, payload)
 
         message_content = response_data.get("candidates", [{}])[0].get("content", {}).get("parts", [{}])[0].get("text", "")
         tool_call = response_data.get("candidates", [{}])[0].get("content", {}).get("parts", [{}])[0].get("functionCall", None)
@@ -167,16 +165,8 @@ async def gemini_processor(data: Dict[str, Any]) -> LlmResponseStruct:
 
         return LlmResponseStruct(Data=asdict(final_format), Error=None, Status=True)
 
-    except requests.exceptions.RequestException as req_err:
-        err_data = None
-        if hasattr(req_err, 'response') and req_err.response is not None:
-            try:
-                err_data = req_err.response.json()
-            except ValueError:
-                err_data = req_err.response.text
-        else:
-            err_data = str(req_err)
-        return LlmResponseStruct(Data=None, Error=err_data, Status=False)
+    except LlmHttpError as req_err:
+        return LlmResponseStruct(Data=None, Error=req_err.error_data, Status=False)
 
     except Exception as err:
         return LlmResponseStruct(Data=None, Error=err, Status=False)
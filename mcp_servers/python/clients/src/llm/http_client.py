@@ -0,0 +1,69 @@
+import asyncio
+import aiohttp
+from typing import Dict, Any
+from urllib.parse import urlsplit
+
+from src.client_and_server_config import HttpClientConfig
+
+
+class LlmHttpError(Exception):
+    """Raised when an LLM provider request fails. `error_data` holds the decoded error body when available."""
+    def __init__(self, error_data: Any):
+        super().__init__(str(error_data))
+        self.error_data = error_data
+
+
+# One pooled keep-alive session per provider host (scheme://host:port)
+_sessions: Dict[str, aiohttp.ClientSession] = {}
+
+
+def _host_key(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _get_session(url: str) -> aiohttp.ClientSession:
+    """Return the shared session for the url's host, creating it on first use."""
+    key = _host_key(url)
+    session = _sessions.get(key)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(
+            limit_per_host=HttpClientConfig.get("max_connections_per_host", 32),
+            keepalive_timeout=HttpClientConfig.get("keepalive_timeout", 60),
+            ttl_dns_cache=300
+        )
+        timeout = aiohttp.ClientTimeout(
+            total=HttpClientConfig.get("total_timeout", 120),
+            connect=HttpClientConfig.get("connect_timeout", 10),
+            sock_read=HttpClientConfig.get("read_timeout", 60)
+        )
+        session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        _sessions[key] = session
+    return session
+
+
+async def post_json(url: str, headers: Dict[str, str], payload: Dict[str, Any]) -> Dict[str, Any]:
+    """POST a JSON payload and return the decoded JSON response without blocking the event loop."""
+    session = _get_session(url)
+    try:
+        async with session.post(url, headers=headers, json=payload) as resp:
+            if resp.status >= 400:
+                try:
+                    err_data = await resp.json(content_type=None)
+                except ValueError:
+                    err_data = await resp.text()
+                raise LlmHttpError(err_data)
+            return await resp.json(content_type=None)
+    except aiohttp.ClientError as err:
+        raise LlmHttpError(str(err))
+    except asyncio.TimeoutError:
+        raise LlmHttpError(f"Request to {_host_key(url)} timed out")
+
+
+async def close_all_sessions():
+    """Close every pooled provider session. Called on app shutdown."""
+    sessions = list(_sessions.values())
+    _sessions.clear()
+    for session in sessions:
+        if not session.closed:
+            await session.close()
@@ -1,8 +1,9 @@
-import requests
 import json
 from typing import Dict, List, Any, Optional, Union
 from dataclasses import dataclass, field, asdict
 
+from src.llm.http_client import post_json, LlmHttpError
+
 @dataclass
 class ChatMessage:
     role: str
@@ -104,9 +105,7 @@ async def openai_processor(data: Dict[str, Any]) -> LlmResponseStruct:
         url = f"https://api.openai.com/v1/chat/completions"
         headers = {'Content-Type': 'application/json', 'Authorization': f'Bearer {params.api_key}'}
 
-        resp = requests.post(url, headers=headers, json=payload, timeout=60)
-        resp.raise_for_status()
-        response_data = resp.json()
+        response_data = await post_json(url, headers, payload)
 
         # Detect tool calls
         choices = response_data.get('choices', [])
@@ -134,16 +133,8 @@ async def openai_processor(data: Dict[str, Any]) -> LlmResponseStruct:
         # Return as dict to avoid subscript errors
         return LlmResponseStruct(Data=asdict(final_format), Error=None, Status=True)
 
-    except requests.exceptions.RequestException as req_err:
-        err_data = None
-        if hasattr(req_err, 'response') and req_err.response is not None:
-            try:
-                err_data = req_err.response.json()
-            except ValueError:
-                err_data = req_err.response.text
-        else:
-            err_data = str(req_err)
-        return LlmResponseStruct(Data=None, Error=err_data, Status=False)
+    except LlmHttpError as req_err:
+        return LlmResponseStruct(Data=None, Error=req_err.error_data, Status=False)
 
     except Exception as err:
         return LlmResponseStruct(Data=None, Error=err, Status=False)
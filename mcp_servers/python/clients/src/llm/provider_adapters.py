@@ -0,0 +1,115 @@
+import json
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional, Union, Callable, Awaitable
+
+from src.llm.azureopenai import azure_openai_processor
+from src.llm.openai import openai_processor
+from src.llm.gemini import gemini_processor
+
+@dataclass
+class LlmTurn:
+    """One LLM round trip normalized across providers."""
+    Data: Optional[Dict[str, Any]]
+    Error: Optional[Union[Exception, str, Dict[str, Any]]]
+    Status: bool
+    content: str = ''
+    tool_calls: List[Dict[str, Any]] = field(default_factory=list)
+
+def parse_tool_arguments(args_raw: Any) -> Dict[str, Any]:
+    """Tool arguments arrive as a JSON string (OpenAI) or an object (Gemini)."""
+    if isinstance(args_raw, str):
+        try:
+            args = json.loads(args_raw) if args_raw else {}
+        except json.JSONDecodeError:
+            args = {}
+    else:
+        args = args_raw or {}
+    return args if isinstance(args, dict) else {}
+
+class ProviderAdapter:
+    """
+    Wraps a provider processor and turns its raw response into an LlmTurn.
+    Subclasses only need to know where the text and tool calls live in the response body.
+    """
+    # Role used when feeding tool results back into chat_history
+    history_role = "assistant"
+    # Upper bound on tool-calling rounds per request, None for unbounded
+    max_tool_rounds: Optional[int] = None
+    # Whether the selected tools stay available after the first tool round
+    keep_tools_after_first_round = True
+
+    def __init__(self, processor: Callable[[Dict[str, Any]], Awaitable[Any]]):
+        self.processor = processor
+
+    async def complete(self, client_details: Dict[str, Any]) -> LlmTurn:
+        response = await self.processor(client_details)
+        if not response.Status:
+            return LlmTurn(Data=response.Data, Error=response.Error, Status=False)
+
+        final_llm_response = response.Data.get("final_llm_response") or {}
+        return LlmTurn(
+            Data=response.Data,
+            Error=response.Error,
+            Status=True,
+            content=self.extract_content(final_llm_response) or '',
+            tool_calls=self.extract_tool_calls(final_llm_response)
+        )
+
+    def extract_content(self, final_llm_response: Dict[str, Any]) -> Optional[str]:
+        raise NotImplementedError
+
+    def extract_tool_calls(self, final_llm_response: Dict[str, Any]) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+class OpenAiChatAdapter(ProviderAdapter):
+    """OpenAI and Azure OpenAI chat completions."""
+
+    def _message(self, final_llm_response: Dict[str, Any]) -> Dict[str, Any]:
+        choices = final_llm_response.get("choices") or [{}]
+        return choices[0].get("message", {}) or {}
+
+    def extract_content(self, final_llm_response: Dict[str, Any]) -> Optional[str]:
+        return self._message(final_llm_response).get("content")
+
+    def extract_tool_calls(self, final_llm_response: Dict[str, Any]) -> List[Dict[str, Any]]:
+        tool_calls = []
+        for tool in self._message(final_llm_response).get("tool_calls") or []:
+            tool_calls.append({
+                "id": tool.get("id"),
+                "name": tool.get("function", {}).get("name"),
+                "arguments": parse_tool_arguments(tool.get("function", {}).get("arguments", "{}")),
+            })
+        return tool_calls
+
+class GeminiAdapter(ProviderAdapter):
+    """Gemini generateContent."""
+    history_role = "model"
+    max_tool_rounds = 2
+    keep_tools_after_first_round = False
+
+    def _parts(self, final_llm_response: Dict[str, Any]) -> List[Dict[str, Any]]:
+        candidates = final_llm_response.get("candidates") or [{}]
+        content = candidates[0].get("content", {}) if isinstance(candidates[0], dict) else {}
+        return content.get("parts", []) if isinstance(content, dict) else []
+
+    def extract_content(self, final_llm_response: Dict[str, Any]) -> Optional[str]:
+        return "".join(part.get("text", "") for part in self._parts(final_llm_response))
+
+    def extract_tool_calls(self, final_llm_response: Dict[str, Any]) -> List[Dict[str, Any]]:
+        tool_calls = []
+        for part in self._parts(final_llm_response):
+            function_call = part.get("functionCall")
+            if not function_call:
+                continue
+            tool_calls.append({
+                "id": part.get("id"),
+                "name": function_call.get("name"),
+                "arguments": parse_tool_arguments(function_call.get("args", {})),
+            })
+        return tool_calls
+
+ProviderAdapters: Dict[str, ProviderAdapter] = {
+    "MCP_CLIENT_AZURE_AI": OpenAiChatAdapter(azure_openai_processor),
+    "MCP_CLIENT_OPENAI": OpenAiChatAdapter(openai_processor),
+    "MCP_CLIENT_GEMINI": GeminiAdapter(gemini_processor),
+}
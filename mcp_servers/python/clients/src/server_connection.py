@@ -1,11 +1,13 @@
 import os
+import time
 import asyncio
 import warnings
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
 from contextlib import AsyncExitStack
-from src.client_and_server_config import ServersConfig
-from mcp import ClientSession, StdioServerParameters
+import anyio
+from src.client_and_server_config import ServersConfig, ToolCatalogConfig, MCPPoolConfig
+from mcp import ClientSession, StdioServerParameters, types
 from mcp.client.stdio import stdio_client
 from mcp import ClientSession, StdioServerParameters
 
@@ -16,55 +18,325 @@ warnings.filterwarnings("ignore", category=ResourceWarning, message="unclosed tr
 # Suppress specific ResourceWarning related to unclosed transport
 warnings.filterwarnings("ignore", category=ResourceWarning, message="unclosed transport .*")
 
-# Global session store
-MCPServers: Dict[str, ClientSession] = {}
+# Global session pool store
+MCPServers: Dict[str, "MCPSessionPool"] = {}
 
+# Startup status and duration per server
+MCPStartupTimings: Dict[str, Dict[str, Any]] = {}
 
-async def initialize_all_mcp(exit_stack):
-    """Initialize all MCP clients based on server configuration"""
-    for server in ServersConfig:
+# Startup tasks still running after the app started serving
+_pending_startups: List[asyncio.Task] = []
+
+# Cached tool catalog per server, already in the function-calling schema
+MCPToolCatalog: Dict[str, Dict[str, Any]] = {}
+
+
+def convert_tools_to_function_schema(tools) -> List[Dict[str, Any]]:
+    """Convert MCP tool definitions into OpenAI-style function tool dicts."""
+    tools_arr = []
+    for tool in tools:
+        tools_arr.append({
+            "type": "function",
+            "function": {
+                "name": tool.name,
+                "description": getattr(tool, "description", f"Tool for {tool.name}"),
+                "parameters": getattr(tool, "inputSchema", {
+                    "type": "object",
+                    "properties": {},
+                    "required": []
+                })
+            }
+        })
+    return tools_arr
+
+
+def store_tool_catalog(server_name: str, tools) -> None:
+    MCPToolCatalog[server_name] = {
+        "tools": convert_tools_to_function_schema(tools),
+        "fetched_at": time.monotonic()
+    }
+
+
+def invalidate_tool_catalog(server_name: str) -> None:
+    MCPToolCatalog.pop(server_name, None)
+
+
+async def get_tool_catalog(server_name: str) -> List[Dict[str, Any]]:
+    """Return the cached tools for a server, refetching when missing or older than the TTL."""
+    entry = MCPToolCatalog.get(server_name)
+    ttl = ToolCatalogConfig.get("ttl_seconds")
+    if entry is None or (ttl and time.monotonic() - entry["fetched_at"] > ttl):
+        tools_response = await MCPServers[server_name].list_tools()
+        store_tool_catalog(server_name, tools_response.tools if tools_response else [])
+        entry = MCPToolCatalog[server_name]
+    return entry["tools"]
+
+
+def make_message_handler(server_name: str):
+    """Build a session message handler that drops the cached catalog on tools/list_changed."""
+    async def message_handler(message):
+        notification = getattr(message, "root", message)
+        if isinstance(notification, types.ToolListChangedNotification):
+            print(f"Tool list changed for {server_name}, invalidating cached catalog")
+            invalidate_tool_catalog(server_name)
+    return message_handler
+
+
+class PooledSession:
+    """One stdio subprocess and its ClientSession, owned by a dedicated task so it can be torn down on its own."""
+
+    def __init__(self, server_params: StdioServerParameters, message_handler):
+        self.server_params = server_params
+        self.message_handler = message_handler
+        self.session: Optional[ClientSession] = None
+        self.outstanding = 0
+        self.healthy = False
+        self._ready = asyncio.Event()
+        self._stop = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def alive(self) -> bool:
+        return self.healthy and self._task is not None and not self._task.done()
+
+    async def start(self):
+        """Spawn the subprocess and wait until the session has been initialized."""
+        self._task = asyncio.create_task(self._run())
+        ready_waiter = asyncio.create_task(self._ready.wait())
+        try:
+            await asyncio.wait({self._task, ready_waiter}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            ready_waiter.cancel()
+        if not self._ready.is_set():
+            # Re-raise the startup failure from the owner task
+            self._task.result()
+            raise RuntimeError("MCP session exited before initialization")
+
+    async def _run(self):
+        try:
+            async with stdio_client(self.server_params) as (stdio, write):
+                async with ClientSession(stdio, write, message_handler=self.message_handler) as session:
+                    await session.initialize()
+                    self.session = session
+                    self.healthy = True
+                    self._ready.set()
+                    await self._stop.wait()
+        finally:
+            self.healthy = False
+            self.session = None
+
+    async def close(self):
+        self.healthy = False
+        self._stop.set()
+        if self._task is None:
+            return
+        if not self._ready.is_set():
+            # Still starting up; nothing to shut down gracefully
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            return
         try:
-            print(f"\n================= Initializing {server['server_name']} mcp server start ===============")
-            print(f"Server name        : {server['server_name']}")
-            print(f"Server command     : {server['command']}")
-            print(f"Server args        : {server['args']}")
-            print(f"cwd                : {os.getcwd()}")
-
-            # Optional directory existence check
-            if "--directory" in server["args"]:
-                dir_index = server["args"].index("--directory")
-                if dir_index + 1 < len(server["args"]):
-                    relative_path = server["args"][dir_index + 1]
-                    absolute_path = os.path.abspath(relative_path)
-                    print(f"Relative path      : {relative_path}")
-                    print(f"Absolute path      : {absolute_path}")
-                    print(f"Path exists        : {os.path.exists(absolute_path)}")
-
-            # Start stdio client
-            server_params = StdioServerParameters(
-                command=server["command"], 
-                args=server["args"],
-                env=server.get("env"),
-                cwd=server.get("cwd")
-            )
-            stdio_transport = await exit_stack.enter_async_context(stdio_client(server_params))
-            stdio, write = stdio_transport
-
-            session = await exit_stack.enter_async_context(ClientSession(stdio, write))
-            await session.initialize()
-
-
-            # Save session globally
-            MCPServers[server["server_name"]] = session
-
-            # Confirm connection
-            tools_response = await session.list_tools()
-            tool_names = [tool.name for tool in tools_response.tools]
-            print(f"Connected to {server['server_name']} with tools: {tool_names}")
-            print(f"\n================= Initializing {server['server_name']} mcp server end ===============")
+            await asyncio.wait_for(self._task, timeout=MCPPoolConfig.get("shutdown_timeout", 5))
+        except Exception:
+            self._task.cancel()
+
 
+class MCPSessionPool:
+    """Pool of stdio sessions for one MCP server. Requests go to the live session with the fewest outstanding calls."""
+
+    def __init__(self, server: Dict[str, Any]):
+        self.server_name = server["server_name"]
+        self.pool_size = max(1, int(server.get("pool_size", MCPPoolConfig.get("pool_size", 1))))
+        self.server_params = StdioServerParameters(
+            command=server["command"],
+            args=server["args"],
+            env=server.get("env"),
+            cwd=server.get("cwd")
+        )
+        self.message_handler = make_message_handler(self.server_name)
+        self.members: List[PooledSession] = []
+        self._health_task: Optional[asyncio.Task] = None
+
+    async def _spawn(self, count: int) -> List[PooledSession]:
+        """Start `count` sessions concurrently and return the ones that came up."""
+        candidates = [PooledSession(self.server_params, self.message_handler) for _ in range(count)]
+        try:
+            results = await asyncio.gather(*(member.start() for member in candidates), return_exceptions=True)
+        except asyncio.CancelledError:
+            # Startup timed out; don't leave half-started subprocesses behind
+            await asyncio.gather(*(member.close() for member in candidates), return_exceptions=True)
+            raise
+        started = []
+        for member, res in zip(candidates, results):
+            if isinstance(res, BaseException):
+                print(f"Error starting {self.server_name} session =========>>>> {res}")
+                await member.close()
+            else:
+                started.append(member)
+        return started
+
+    async def start(self):
+        self.members = await self._spawn(self.pool_size)
+        if not self.members:
+            raise RuntimeError(f"No sessions could be started for {self.server_name}")
+        self._health_task = asyncio.create_task(self._health_check_loop())
+
+    def _acquire(self) -> PooledSession:
+        live = [member for member in self.members if member.alive]
+        if not live:
+            raise RuntimeError(f"No live sessions available for {self.server_name}")
+        return min(live, key=lambda member: member.outstanding)
+
+    async def _dispatch(self, method: str, *args, **kwargs):
+        member = self._acquire()
+        member.outstanding += 1
+        try:
+            return await getattr(member.session, method)(*args, **kwargs)
+        except (anyio.ClosedResourceError, anyio.BrokenResourceError, anyio.EndOfStream):
+            # The subprocess went away; the health check will replace it
+            member.healthy = False
+            raise
+        finally:
+            member.outstanding -= 1
+
+    async def call_tool(self, name: str, arguments: Optional[Dict[str, Any]] = None, **kwargs):
+        return await self._dispatch("call_tool", name, arguments, **kwargs)
+
+    async def list_tools(self, *args, **kwargs):
+        return await self._dispatch("list_tools", *args, **kwargs)
+
+    async def _ping(self, member: PooledSession):
+        try:
+            await asyncio.wait_for(member.session.send_ping(), timeout=MCPPoolConfig.get("ping_timeout", 10))
         except Exception as err:
-            print(f"Error initializing {server['server_name']} mcp server =========>>>> {err}")
-            continue
+            print(f"Health check failed for {self.server_name} session =========>>>> {err}")
+            member.healthy = False
+
+    async def check_health(self):
+        """Ping idle sessions, drop dead ones and start replacements up to the pool size."""
+        idle = [member for member in self.members if member.alive and member.outstanding == 0]
+        await asyncio.gather(*(self._ping(member) for member in idle))
+
+        dead = [member for member in self.members if not member.alive]
+        for member in dead:
+            self.members.remove(member)
+            await member.close()
+
+        missing = self.pool_size - len(self.members)
+        if missing > 0:
+            print(f"Replacing {missing} {self.server_name} session(s)")
+            self.members.extend(await self._spawn(missing))
+
+    async def _health_check_loop(self):
+        interval = MCPPoolConfig.get("health_check_interval", 30)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.check_health()
+            except Exception as err:
+                print(f"Error checking {self.server_name} sessions =========>>>> {err}")
+
+    async def close(self):
+        if self._health_task:
+            self._health_task.cancel()
+            self._health_task = None
+        members, self.members = self.members, []
+        await asyncio.gather(*(member.close() for member in members), return_exceptions=True)
+
+
+async def initialize_mcp_server(server: Dict[str, Any], exit_stack) -> bool:
+    """Start one server's session pool within its startup timeout and register it once ready."""
+    server_name = server["server_name"]
+    startup_timeout = server.get("startup_timeout", MCPPoolConfig.get("startup_timeout", 60))
+    MCPStartupTimings[server_name] = {"status": "starting", "seconds": None}
+    started_at = time.monotonic()
+    try:
+        print(f"\n================= Initializing {server_name} mcp server start ===============")
+        print(f"Server name        : {server_name}")
+        print(f"Server command     : {server['command']}")
+        print(f"Server args        : {server['args']}")
+        print(f"cwd                : {os.getcwd()}")
+
+        # Optional directory existence check
+        if "--directory" in server["args"]:
+            dir_index = server["args"].index("--directory")
+            if dir_index + 1 < len(server["args"]):
+                relative_path = server["args"][dir_index + 1]
+                absolute_path = os.path.abspath(relative_path)
+                print(f"Relative path      : {relative_path}")
+                print(f"Absolute path      : {absolute_path}")
+                print(f"Path exists        : {os.path.exists(absolute_path)}")
+
+        pool = MCPSessionPool(server)
+
+        async def start_pool():
+            await pool.start()
+            return await pool.list_tools()
+
+        try:
+            tools_response = await asyncio.wait_for(start_pool(), timeout=startup_timeout)
+        except BaseException:
+            # Timed out, failed or cancelled part-way (sessions may already be up during list_tools): stop them now
+            await pool.close()
+            raise
+        # Release the pool with the app's exit stack
+        exit_stack.push_async_callback(pool.close)
+        store_tool_catalog(server_name, tools_response.tools)
+
+        # Save pool globally
+        MCPServers[server_name] = pool
+
+        elapsed = time.monotonic() - started_at
+        MCPStartupTimings[server_name] = {"status": "ready", "seconds": round(elapsed, 3)}
+        tool_names = [tool.name for tool in tools_response.tools]
+        print(f"Connected to {server_name} with tools: {tool_names}")
+        print(f"Pool size          : {len(pool.members)}/{pool.pool_size}")
+        print(f"Startup time       : {elapsed:.3f}s")
+        print(f"\n================= Initializing {server_name} mcp server end ===============")
+        return True
+
+    except asyncio.TimeoutError:
+        elapsed = time.monotonic() - started_at
+        MCPStartupTimings[server_name] = {"status": "timeout", "seconds": round(elapsed, 3)}
+        print(f"Error initializing {server_name} mcp server =========>>>> startup timed out after {startup_timeout}s")
+        return False
+
+    except Exception as err:
+        elapsed = time.monotonic() - started_at
+        MCPStartupTimings[server_name] = {"status": "failed", "seconds": round(elapsed, 3)}
+        print(f"Error initializing {server_name} mcp server =========>>>> {err}")
+        return False
+
+
+async def _report_startup_timings(tasks: List[asyncio.Task]):
+    await asyncio.gather(*tasks, return_exceptions=True)
+    print("\n================= MCP server startup timings ===============")
+    for server_name, timing in sorted(MCPStartupTimings.items(), key=lambda item: item[1]["seconds"] or 0, reverse=True):
+        print(f"{server_name:<30}: {timing['status']:<8} {timing['seconds']}s")
+
+
+async def _cancel_pending_startups():
+    for task in _pending_startups:
+        task.cancel()
+    await asyncio.gather(*_pending_startups, return_exceptions=True)
+    _pending_startups.clear()
+
+
+async def initialize_all_mcp(exit_stack):
+    """Initialize all MCP clients concurrently. Returns once the first server is ready; slower servers register in the background."""
+    tasks = [asyncio.create_task(initialize_mcp_server(server, exit_stack)) for server in ServersConfig]
+    if not tasks:
+        return False
+
+    _pending_startups.extend(tasks)
+    _pending_startups.append(asyncio.create_task(_report_startup_timings(tasks)))
+    # Stop startups still in flight when the app shuts down
+    exit_stack.push_async_callback(_cancel_pending_startups)
+
+    pending = set(tasks)
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        if any(task.result() for task in done):
+            return True
 
-    return True
\ No newline at end of file
+    return False
@@ -0,0 +1,91 @@
+import os
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional
+import discord
+
+logger = logging.getLogger(__name__)
+
+# Requests a batch tool keeps in flight. discord.py paces them to each route's rate-limit bucket
+# and sleeps through 429s, so this only bounds how many wait on a bucket at once.
+BATCH_CONCURRENCY = int(os.getenv("DISCORD_BATCH_CONCURRENCY", "10"))
+# Largest list a batch tool accepts in one call
+BATCH_MAX_ITEMS = int(os.getenv("DISCORD_BATCH_MAX_ITEMS", "1000"))
+# Per-item failures listed in a result; the rest are only counted
+MAX_REPORTED_ERRORS = 20
+
+Progress = Callable[[int, int], Awaitable[None]]
+
+
+def check_batch_size(items: list, what: str):
+    if not items:
+        raise ValueError(f"At least one {what} is required.")
+    if len(items) > BATCH_MAX_ITEMS:
+        raise ValueError(f"At most {BATCH_MAX_ITEMS} {what}s can be processed in one call; got {len(items)}.")
+
+
+def _describe_error(e: Exception) -> str:
+    if isinstance(e, discord.Forbidden):
+        return "the bot does not have the required permissions"
+    if isinstance(e, discord.HTTPException):
+        return e.text or str(e)
+    return str(e)
+
+
+async def run_batch(items: list, operation: Callable[[object], Awaitable[None]], label: Callable[[object], str],
+                    progress: Optional[Progress] = None, concurrency: int = BATCH_CONCURRENCY) -> dict:
+    """
+    Apply operation to every item with at most `concurrency` requests in flight.
+    Failures don't stop the batch; progress(done, total) is awaited after each item completes.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    total = len(items)
+    done = 0
+    succeeded = []
+    failed = []
+
+    async def run(item):
+        nonlocal done
+        async with semaphore:
+            try:
+                await operation(item)
+                succeeded.append(label(item))
+            except (discord.HTTPException, ValueError) as e:
+                failed.append((label(item), _describe_error(e)))
+        done += 1
+        if progress:
+            try:
+                await progress(done, total)
+            except Exception as e:
+                logger.warning(f"Failed to send progress notification: {e}")
+
+    await asyncio.gather(*(run(item) for item in items))
+    return {"succeeded": succeeded, "failed": failed}
+
+
+def format_batch_result(action: str, total: int, result: dict, unresolved: Optional[list] = None) -> str:
+    """Summary line plus the failures (unresolved names first), at most MAX_REPORTED_ERRORS of them."""
+    failures = list(unresolved or []) + result["failed"]
+    lines = [f"{action}: {len(result['succeeded'])} of {total} succeeded, {len(failures)} failed."]
+    if failures:
+        lines.append("Failures:")
+        lines.extend(f"- '{name}': {reason}" for name, reason in failures[:MAX_REPORTED_ERRORS])
+        if len(failures) > MAX_REPORTED_ERRORS:
+            lines.append(f"- ... and {len(failures) - MAX_REPORTED_ERRORS} more")
+    return "\n".join(lines)
+
+
+def resolve_names(names: list, resolve: Callable[[str], object], kind: str) -> tuple:
+    """
+    Resolve every name up front, before any request is sent.
+    Returns the distinct matches and (name, reason) pairs for names that matched nothing.
+    """
+    matches = {}
+    unresolved = []
+    for name in names:
+        match = resolve(name)
+        if match is None:
+            unresolved.append((name, f"{kind} not found"))
+        else:
+            matches.setdefault(match.id, match)
+    return list(matches.values()), unresolved
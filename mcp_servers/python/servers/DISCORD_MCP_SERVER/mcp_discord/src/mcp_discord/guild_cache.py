@@ -0,0 +1,213 @@
+import os
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+import discord
+from .utils import NameIndex
+
+logger = logging.getLogger(__name__)
+
+# Channels and roles older than this are refetched before a tool uses them
+SNAPSHOT_TTL_SECONDS = float(os.getenv("DISCORD_SNAPSHOT_TTL_SECONDS", "60"))
+# The member list is only fetched for member tools, and kept for longer since it pages the whole guild
+MEMBER_CACHE_TTL_SECONDS = float(os.getenv("DISCORD_MEMBER_CACHE_TTL_SECONDS", "300"))
+# Distinct bot tokens kept logged in at once (least recently used is closed)
+MAX_SESSIONS = int(os.getenv("DISCORD_MAX_SESSIONS", "8"))
+# Sessions unused for longer than this are closed
+SESSION_MAX_IDLE_SECONDS = float(os.getenv("DISCORD_SESSION_MAX_IDLE_SECONDS", "1800"))
+
+
+def _new_client() -> discord.Client:
+    intents = discord.Intents.default()
+    intents.members = True
+    intents.guilds = True
+    intents.messages = True
+    intents.message_content = True
+    return discord.Client(intents=intents)
+
+
+class GuildSnapshot:
+    """
+    Channels, roles and (lazily) members of one guild, as fetched over REST.
+    Tools that change channels or roles call invalidate() so the next call sees their effect.
+    """
+
+    def __init__(self, client: discord.Client, guild_id: int):
+        self.client = client
+        self.guild_id = guild_id
+        self.guild = None
+        self.channels = []
+        self.members = []
+        self.fetched_at = None
+        self.members_fetched_at = None
+        self._indexes = {}  # name -> NameIndex, dropped whenever what it indexes is refetched
+        self._lock = asyncio.Lock()
+
+    @property
+    def roles(self) -> list:
+        return list(self.guild.roles) if self.guild else []
+
+    @property
+    def text_channels(self) -> list:
+        return [c for c in self.channels if isinstance(c, discord.TextChannel)]
+
+    @property
+    def voice_channels(self) -> list:
+        return [c for c in self.channels if isinstance(c, discord.VoiceChannel)]
+
+    @property
+    def categories(self) -> list:
+        return [c for c in self.channels if isinstance(c, discord.CategoryChannel)]
+
+    def _index(self, name: str, choices) -> NameIndex:
+        if name not in self._indexes:
+            self._indexes[name] = NameIndex(choices())
+        return self._indexes[name]
+
+    @property
+    def channel_index(self) -> NameIndex:
+        """Text and voice channels."""
+        return self._index("channels", lambda: self.text_channels + self.voice_channels)
+
+    @property
+    def any_channel_index(self) -> NameIndex:
+        """Text and voice channels and categories."""
+        return self._index("any_channels", lambda: self.text_channels + self.voice_channels + self.categories)
+
+    @property
+    def category_index(self) -> NameIndex:
+        return self._index("categories", lambda: self.categories)
+
+    @property
+    def role_index(self) -> NameIndex:
+        return self._index("roles", lambda: self.roles)
+
+    @property
+    def member_index(self) -> NameIndex:
+        """Members as of the last get_members()."""
+        return self._index("members", lambda: self.members)
+
+    @staticmethod
+    def _stale(fetched_at, ttl: float) -> bool:
+        return fetched_at is None or time.monotonic() - fetched_at > ttl
+
+    async def refresh(self, force: bool = False):
+        """Refetch the guild (which carries its roles) and its channels if the snapshot is older than SNAPSHOT_TTL_SECONDS."""
+        async with self._lock:
+            if not force and not self._stale(self.fetched_at, SNAPSHOT_TTL_SECONDS):
+                return
+            try:
+                guild = await self.client.fetch_guild(self.guild_id)
+            except discord.NotFound:
+                guild = None
+            if not guild:
+                raise ValueError(f"Could not find a guild with ID: {self.guild_id}. Ensure the bot is in the server and the ID is correct.")
+            self.guild = guild
+            self.channels = await guild.fetch_channels()
+            self.fetched_at = time.monotonic()
+            for name in ("channels", "any_channels", "categories", "roles"):
+                self._indexes.pop(name, None)
+            logger.info(f"Fetched {len(self.channels)} channels and {len(guild.roles)} roles from guild '{guild.name}'.")
+
+    async def get_members(self) -> list:
+        """The guild's members, paged in on first use and then again once older than MEMBER_CACHE_TTL_SECONDS."""
+        async with self._lock:
+            if self._stale(self.members_fetched_at, MEMBER_CACHE_TTL_SECONDS):
+                self.members = [member async for member in self.guild.fetch_members(limit=None)]
+                self.members_fetched_at = time.monotonic()
+                self._indexes.pop("members", None)
+                logger.info(f"Fetched {len(self.members)} members from guild '{self.guild.name}'.")
+            return self.members
+
+    def invalidate(self):
+        """Mark channels and roles stale after a tool changed them."""
+        self.fetched_at = None
+
+
+class DiscordSession:
+    def __init__(self, token: str):
+        self.token = token
+        self.client = _new_client()
+        self.snapshots = {}  # guild_id -> GuildSnapshot
+        self.logged_in = False
+        self.last_used = time.monotonic()
+        self.in_use = 0
+        self._login_lock = asyncio.Lock()
+
+    async def login(self):
+        async with self._login_lock:
+            if self.logged_in:
+                return
+            try:
+                await self.client.login(self.token)
+            except discord.LoginFailure:
+                raise ValueError("The Discord bot token was rejected.")
+            self.logged_in = True
+            logger.info(f"Logged in to Discord as {self.client.user}.")
+
+    def snapshot(self, guild_id: int) -> GuildSnapshot:
+        if guild_id not in self.snapshots:
+            self.snapshots[guild_id] = GuildSnapshot(self.client, guild_id)
+        return self.snapshots[guild_id]
+
+
+class SessionCache:
+    """
+    One logged-in discord.Client per bot token, reused across tool calls together with its guild snapshots.
+    Sessions are only closed once no call is using them.
+    """
+
+    def __init__(self, max_sessions: int = MAX_SESSIONS, max_idle_seconds: float = SESSION_MAX_IDLE_SECONDS):
+        self.max_sessions = max_sessions
+        self.max_idle_seconds = max_idle_seconds
+        self._sessions = OrderedDict()  # token -> DiscordSession
+
+    async def _close(self, session: DiscordSession):
+        try:
+            await session.client.close()
+        except Exception as e:
+            logger.warning(f"Error closing Discord client: {e}")
+
+    def _evict(self) -> list:
+        """Pop idle and excess sessions that aren't in use. The caller closes what is returned."""
+        now = time.monotonic()
+        evicted = []
+        for token, session in list(self._sessions.items()):
+            if session.in_use == 0 and now - session.last_used > self.max_idle_seconds:
+                evicted.append(self._sessions.pop(token))
+        for token, session in list(self._sessions.items()):
+            if len(self._sessions) <= self.max_sessions:
+                break
+            if session.in_use == 0:
+                evicted.append(self._sessions.pop(token))
+        return evicted
+
+    @asynccontextmanager
+    async def guild(self, token: str, guild_id: int):
+        """Borrow an up-to-date snapshot of guild_id, seen through the session for token, for the duration of the block."""
+        session = self._sessions.pop(token, None) or DiscordSession(token)
+        self._sessions[token] = session
+        session.in_use += 1
+        session.last_used = time.monotonic()
+        try:
+            await session.login()
+            snapshot = session.snapshot(guild_id)
+            await snapshot.refresh()
+            yield snapshot
+        finally:
+            session.in_use -= 1
+            session.last_used = time.monotonic()
+            if not session.logged_in and session.in_use == 0 and self._sessions.get(token) is session:
+                del self._sessions[token]
+                await self._close(session)
+            evicted = self._evict()
+            await asyncio.gather(*(self._close(old) for old in evicted))
+
+    async def close_all(self):
+        sessions, self._sessions = list(self._sessions.values()), OrderedDict()
+        await asyncio.gather(*(self._close(session) for session in sessions))
+
+
+session_cache = SessionCache()
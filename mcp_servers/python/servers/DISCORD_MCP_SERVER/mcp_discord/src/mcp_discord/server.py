@@ -3,7 +3,8 @@ import logging
 import discord
 from mcp.server import Server
 from mcp.types import Tool, TextContent
-from . import utils
+from . import utils, batch
+from .guild_cache import session_cache
 
 # Logging configuration
 log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -23,15 +24,8 @@ logger.addHandler(stream_handler)
 # Initialize the MCP Server with a unique name
 app = Server("mcp-discord")
 
-# Helper function to get the Discord client
-def get_discord_client(token: str) -> discord.Client:
-    intents = discord.Intents.default()
-    intents.members = True
-    intents.guilds = True
-    intents.messages = True
-    intents.message_content = True
-    client = discord.Client(intents=intents)
-    return client
+# Tools that resolve members by name; only these page in the guild's member list
+MEMBER_TOOLS = {"give_role_to_member", "remove_role_from_member", "give_role_to_members", "remove_role_from_members"}
 
 @app.list_tools()
 async def list_tools() -> list[Tool]:
@@ -156,15 +150,105 @@ async def list_tools() -> list[Tool]:
                 },
                 "required": ["member_name", "role_name"]
             }
+        ),
+        Tool(
+            name="create_text_channels",
+            description="Create several text channels at once, optionally all in one category. Requests run concurrently at Discord's rate limit.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "names": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "The names of the new text channels."
+                    },
+                    "category_name": {
+                        "type": "string",
+                        "description": "Optional: The name of the category to create the channels in."
+                    }
+                },
+                "required": ["names"]
+            }
+        ),
+        Tool(
+            name="move_channels",
+            description="Move several channels to one category. Requests run concurrently at Discord's rate limit.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "channel_names": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "The names of the channels to move."
+                    },
+                    "new_category_name": {
+                        "type": "string",
+                        "description": "The name of the destination category."
+                    }
+                },
+                "required": ["channel_names", "new_category_name"]
+            }
+        ),
+        Tool(
+            name="give_role_to_members",
+            description="Assign a role to several members. Requests run concurrently at Discord's rate limit.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "member_names": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "The names or nicknames of the members."
+                    },
+                    "role_name": {
+                        "type": "string",
+                        "description": "The name of the role to assign."
+                    }
+                },
+                "required": ["member_names", "role_name"]
+            }
+        ),
+        Tool(
+            name="remove_role_from_members",
+            description="Remove a role from several members. Requests run concurrently at Discord's rate limit.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "member_names": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "The names or nicknames of the members."
+                    },
+                    "role_name": {
+                        "type": "string",
+                        "description": "The name of the role to remove."
+                    }
+                },
+                "required": ["member_names", "role_name"]
+            }
         )
     ]
 
 
+def progress_reporter():
+    """Progress callback for batch tools, or None when the client didn't send a progress token."""
+    try:
+        ctx = app.request_context
+    except LookupError:
+        return None
+    token = ctx.meta.progressToken if ctx.meta else None
+    if token is None:
+        return None
+
+    async def report(done: int, total: int):
+        await ctx.session.send_progress_notification(token, done, total)
+    return report
+
+
 @app.call_tool()
 async def call_tool(name: str, arguments: dict) -> list[TextContent]:
     """Execute Discord tools."""
     logger.info(f"Executing tool: {name} with arguments: {arguments}")
-    client = None  # Initialize client to None
     try:
         if "__credentials__" not in arguments:
             raise ValueError("Missing credentials")
@@ -181,120 +265,8 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
         except (ValueError, TypeError):
             raise ValueError("Guild ID must be a valid integer.")
 
-        client = get_discord_client(api_key)
-        await client.login(api_key)
-
-        guild = await client.fetch_guild(guild_id)
-        if not guild:
-            raise ValueError(f"Could not find a guild with ID: {guild_id}. Ensure the bot is in the server and the ID is correct.")
-
-        # Fetch all channels, roles, and members directly from the guild
-        all_channels = await guild.fetch_channels()
-        all_roles = await guild.fetch_roles()
-        all_members = [member async for member in guild.fetch_members(limit=None)]
-        
-        # Manually filter channels by type
-        text_channels = [c for c in all_channels if isinstance(c, discord.TextChannel)]
-        voice_channels = [c for c in all_channels if isinstance(c, discord.VoiceChannel)]
-        categories = [c for c in all_channels if isinstance(c, discord.CategoryChannel)]
-
-        # Get the bot's own member object to ensure it doesn't lock itself out
-        bot_member = guild.me
-
-        logger.info(f"Fetched {len(all_channels)} channels, {len(all_roles)} roles, and {len(all_members)} members from guild '{guild.name}'.")
-
-        if name == "create_text_channel":
-            channel_name = arguments["name"]
-            category_name = arguments.get("category_name")
-            visible_to_roles = arguments.get("visible_to_roles", [])
-
-            category = None
-            if category_name:
-                category = utils.get_category_by_name(category_name, categories)
-                if not category:
-                    raise ValueError(f"Category '{category_name}' not found.")
-
-            new_channel = await guild.create_text_channel(name=channel_name, category=category)
-            if not new_channel:
-                raise RuntimeError(f"Failed to create text channel '{channel_name}'. This may be due to a permission issue.")
-            result_text = f"Successfully created text channel '{new_channel.name}' with ID {new_channel.id}."
-
-        elif name == "create_category":
-            category_name = arguments["name"]
-            new_category = await guild.create_category(name=category_name)
-            if not new_category:
-                raise RuntimeError(f"Failed to create category '{category_name}'. This may be due to a permission issue.")
-            result_text = f"Successfully created category '{new_category.name}' with ID {new_category.id}."
-
-        elif name == "move_channel":
-            channel_name = arguments["channel_name"]
-            new_category_name = arguments["new_category_name"]
-            
-            searchable_channels = text_channels + voice_channels
-            channel = utils.get_channel_by_name(channel_name, searchable_channels)
-            if not channel:
-                raise ValueError(f"Channel '{channel_name}' not found.")
-
-            new_category = utils.get_category_by_name(new_category_name, categories)
-            if not new_category:
-                raise ValueError(f"Category '{new_category_name}' not found.")
-
-            await channel.edit(category=new_category)
-            result_text = f"Successfully moved channel '{channel.name}' to category '{new_category.name}'."
-
-        elif name == "delete_channel":
-            channel_name = arguments["channel_name"]
-            searchable_channels = text_channels + voice_channels + categories
-            
-            channel_names_to_log = [c.name for c in searchable_channels]
-            logger.info(f"Searching for channel '{channel_name}' within the following channels: {channel_names_to_log}")
-
-            channel = utils.get_channel_by_name(channel_name, searchable_channels)
-            if not channel:
-                raise ValueError(f"Channel or category '{channel_name}' not found.")
-            
-            await channel.delete()
-            result_text = f"Successfully deleted '{channel.name}'."
-
-        elif name == "create_role":
-            role_name = arguments["name"]
-            new_role = await guild.create_role(name=role_name)
-            if not new_role:
-                raise RuntimeError(f"Failed to create role '{role_name}'. This may be due to a permission issue.")
-            result_text = f"Successfully created role '{new_role.name}' with ID {new_role.id}."
-
-        elif name == "give_role_to_member":
-            member_name = arguments["member_name"]
-            role_name = arguments["role_name"]
-
-            member = utils.get_member_by_name(member_name, all_members)
-            if not member:
-                raise ValueError(f"Member '{member_name}' not found.")
-
-            role = utils.get_role_by_name(role_name, all_roles)
-            if not role:
-                raise ValueError(f"Role '{role_name}' not found.")
-
-            await member.add_roles(role)
-            result_text = f"Successfully gave role '{role.name}' to member '{member.display_name}'."
-
-        elif name == "remove_role_from_member":
-            member_name = arguments["member_name"]
-            role_name = arguments["role_name"]
-
-            member = utils.get_member_by_name(member_name, all_members)
-            if not member:
-                raise ValueError(f"Member '{member_name}' not found.")
-
-            role = utils.get_role_by_name(role_name, all_roles)
-            if not role:
-                raise ValueError(f"Role '{role_name}' not found.")
-
-            await member.remove_roles(role)
-            result_text = f"Successfully removed role '{role.name}' from member '{member.display_name}'."
-
-        else:
-            raise ValueError(f"Unknown tool: {name}")
+        async with session_cache.guild(api_key, guild_id) as snapshot:
+            result_text = await execute_tool(snapshot, name, arguments, progress_reporter())
 
     except discord.Forbidden:
         result_text = f"Error: The bot does not have the required permissions to perform the action '{name}'."
@@ -302,20 +274,174 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
         result_text = f"Error: {ve}"
     except Exception as e:
         result_text = f"An unexpected error occurred: {e}"
-    finally:
-        if client and not client.is_closed():
-            await client.close()
 
     return [TextContent(type="text", text=result_text)]
 
+
+async def execute_tool(snapshot, name: str, arguments: dict, progress=None) -> str:
+    """Run one tool against a guild snapshot and return its result text."""
+    guild = snapshot.guild
+    if name in MEMBER_TOOLS:
+        await snapshot.get_members()
+
+    if name == "create_text_channel":
+        channel_name = arguments["name"]
+        category_name = arguments.get("category_name")
+        visible_to_roles = arguments.get("visible_to_roles", [])
+
+        category = None
+        if category_name:
+            category = utils.get_category_by_name(category_name, snapshot.category_index)
+            if not category:
+                raise ValueError(f"Category '{category_name}' not found.")
+
+        new_channel = await guild.create_text_channel(name=channel_name, category=category)
+        if not new_channel:
+            raise RuntimeError(f"Failed to create text channel '{channel_name}'. This may be due to a permission issue.")
+        result_text = f"Successfully created text channel '{new_channel.name}' with ID {new_channel.id}."
+
+    elif name == "create_category":
+        category_name = arguments["name"]
+        new_category = await guild.create_category(name=category_name)
+        if not new_category:
+            raise RuntimeError(f"Failed to create category '{category_name}'. This may be due to a permission issue.")
+        result_text = f"Successfully created category '{new_category.name}' with ID {new_category.id}."
+
+    elif name == "move_channel":
+        channel_name = arguments["channel_name"]
+        new_category_name = arguments["new_category_name"]
+        
+        searchable_channels = snapshot.channel_index
+        channel = utils.get_channel_by_name(channel_name, searchable_channels)
+        if not channel:
+            raise ValueError(f"Channel '{channel_name}' not found.")
+
+        new_category = utils.get_category_by_name(new_category_name, snapshot.category_index)
+        if not new_category:
+            raise ValueError(f"Category '{new_category_name}' not found.")
+
+        await channel.edit(category=new_category)
+        result_text = f"Successfully moved channel '{channel.name}' to category '{new_category.name}'."
+
+    elif name == "delete_channel":
+        channel_name = arguments["channel_name"]
+        searchable_channels = snapshot.any_channel_index
+        
+        logger.info(f"Searching for channel '{channel_name}' within {len(searchable_channels)} channels and categories")
+
+        channel = utils.get_channel_by_name(channel_name, searchable_channels)
+        if not channel:
+            raise ValueError(f"Channel or category '{channel_name}' not found.")
+        
+        await channel.delete()
+        result_text = f"Successfully deleted '{channel.name}'."
+
+    elif name == "create_role":
+        role_name = arguments["name"]
+        new_role = await guild.create_role(name=role_name)
+        if not new_role:
+            raise RuntimeError(f"Failed to create role '{role_name}'. This may be due to a permission issue.")
+        result_text = f"Successfully created role '{new_role.name}' with ID {new_role.id}."
+
+    elif name == "give_role_to_member":
+        member_name = arguments["member_name"]
+        role_name = arguments["role_name"]
+
+        member = utils.get_member_by_name(member_name, snapshot.member_index)
+        if not member:
+            raise ValueError(f"Member '{member_name}' not found.")
+
+        role = utils.get_role_by_name(role_name, snapshot.role_index)
+        if not role:
+            raise ValueError(f"Role '{role_name}' not found.")
+
+        await member.add_roles(role)
+        result_text = f"Successfully gave role '{role.name}' to member '{member.display_name}'."
+
+    elif name == "remove_role_from_member":
+        member_name = arguments["member_name"]
+        role_name = arguments["role_name"]
+
+        member = utils.get_member_by_name(member_name, snapshot.member_index)
+        if not member:
+            raise ValueError(f"Member '{member_name}' not found.")
+
+        role = utils.get_role_by_name(role_name, snapshot.role_index)
+        if not role:
+            raise ValueError(f"Role '{role_name}' not found.")
+
+        await member.remove_roles(role)
+        result_text = f"Successfully removed role '{role.name}' from member '{member.display_name}'."
+
+    elif name == "create_text_channels":
+        channel_names = arguments["names"]
+        category_name = arguments.get("category_name")
+        batch.check_batch_size(channel_names, "channel name")
+
+        category = None
+        if category_name:
+            category = utils.get_category_by_name(category_name, snapshot.category_index)
+            if not category:
+                raise ValueError(f"Category '{category_name}' not found.")
+
+        result = await batch.run_batch(
+            channel_names,
+            lambda channel_name: guild.create_text_channel(name=channel_name, category=category),
+            str,
+            progress,
+        )
+        result_text = batch.format_batch_result("Created text channels", len(channel_names), result)
+
+    elif name == "move_channels":
+        channel_names = arguments["channel_names"]
+        new_category_name = arguments["new_category_name"]
+        batch.check_batch_size(channel_names, "channel name")
+
+        new_category = utils.get_category_by_name(new_category_name, snapshot.category_index)
+        if not new_category:
+            raise ValueError(f"Category '{new_category_name}' not found.")
+
+        searchable_channels = snapshot.channel_index
+        channels, unresolved = batch.resolve_names(channel_names, lambda n: utils.get_channel_by_name(n, searchable_channels), "Channel")
+        result = await batch.run_batch(channels, lambda channel: channel.edit(category=new_category), lambda c: c.name, progress)
+        result_text = batch.format_batch_result(f"Moved channels to category '{new_category.name}'", len(channels) + len(unresolved), result, unresolved)
+
+    elif name in ("give_role_to_members", "remove_role_from_members"):
+        member_names = arguments["member_names"]
+        role_name = arguments["role_name"]
+        batch.check_batch_size(member_names, "member name")
+
+        role = utils.get_role_by_name(role_name, snapshot.role_index)
+        if not role:
+            raise ValueError(f"Role '{role_name}' not found.")
+
+        members, unresolved = batch.resolve_names(member_names, lambda n: utils.get_member_by_name(n, snapshot.member_index), "Member")
+        if name == "give_role_to_members":
+            operation, action = (lambda member: member.add_roles(role)), f"Gave role '{role.name}' to members"
+        else:
+            operation, action = (lambda member: member.remove_roles(role)), f"Removed role '{role.name}' from members"
+        result = await batch.run_batch(members, operation, lambda m: m.display_name, progress)
+        result_text = batch.format_batch_result(action, len(members) + len(unresolved), result, unresolved)
+
+    else:
+        raise ValueError(f"Unknown tool: {name}")
+
+    # The other tools all change channels or roles; refetch them on the next call
+    if name not in MEMBER_TOOLS:
+        snapshot.invalidate()
+    return result_text
+
 async def main():
     """Main entry point to run the MCP server."""
     from mcp.server.stdio import stdio_server
 
     logger.info("Starting Discord MCP server...")
-    async with stdio_server() as (read_stream, write_stream):
-        await app.run(
-            read_stream,
-            write_stream,
-            app.create_initialization_options()
-        )
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await app.run(
+                read_stream,
+                write_stream,
+                app.create_initialization_options()
+            )
+    finally:
+        await session_cache.close_all()
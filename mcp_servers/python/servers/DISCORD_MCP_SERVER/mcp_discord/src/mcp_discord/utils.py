@@ -1,70 +1,150 @@
 import re
+import heapq
+from bisect import bisect_left
+from collections import Counter, defaultdict
 from difflib import SequenceMatcher
 import logging
 import discord
 
 logger = logging.getLogger(__name__)
 
+# Names considered per lookup, picked by trigram overlap (plus as many prefix matches)
+MAX_CANDIDATES = 200
+
 def _normalize(s: str) -> str:
     """Converts to lowercase and removes all non-alphanumeric characters."""
     return re.sub(r'[^a-z0-9]', '', s.lower())
 
-def _find_best_match(query: str, choices: list, threshold: float = 0.6):
-    """Find the best match for a query from a list of choices after normalizing names."""
-    if not choices:
-        return None
+def _trigrams(s: str) -> set:
+    """Character trigrams of a normalized name, padded so names shorter than three characters still have some."""
+    padded = f"  {s} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def _names(choice) -> list:
+    # For members, match on both username and display name
+    if isinstance(choice, discord.Member):
+        return [choice.name, choice.display_name]
+    return [choice.name]
+
+def _label(choice) -> str:
+    return f"{choice.name} ({choice.display_name})" if isinstance(choice, discord.Member) else choice.name
+
+class NameIndex:
+    """
+    Normalized names of a list of channels, roles or members, built once per guild snapshot.
+    A lookup is an exact hash hit, or SequenceMatcher over a short list of candidates
+    that share trigrams with the query or start with it.
+    """
+
+    def __init__(self, choices: list):
+        self.choices = list(choices)
+        self._keys = []     # normalized name per entry
+        self._owners = []   # position in choices of the entry's owner
+        self._exact = {}    # normalized name -> position of its first owner
+        self._grams = defaultdict(list)  # trigram -> entries containing it
+        self._by_length = defaultdict(list)  # length of the normalized name -> entries
+        for position, choice in enumerate(self.choices):
+            for key in dict.fromkeys(_normalize(name) for name in _names(choice)):
+                if not key:
+                    continue
+                entry = len(self._keys)
+                self._keys.append(key)
+                self._owners.append(position)
+                self._exact.setdefault(key, position)
+                self._by_length[len(key)].append(entry)
+                for gram in _trigrams(key):
+                    self._grams[gram].append(entry)
+        self._by_key = sorted(range(len(self._keys)), key=self._keys.__getitem__)
+        self._sorted_keys = [self._keys[entry] for entry in self._by_key]
+
+    def __len__(self) -> int:
+        return len(self.choices)
+
+    def _candidates(self, query: str, threshold: float) -> set:
+        # ratio() is at most 2*min(len)/(len+len), so names of very different length can't reach the threshold
+        def possible_length(size):
+            return 2 * min(size, len(query)) / (size + len(query)) >= threshold
+
+        if len(query) < 3:
+            # A name can match a query this short without sharing a trigram with it ("b" and "ab"),
+            # so every name short enough to reach the threshold is scored
+            return {entry for size, entries in self._by_length.items() if possible_length(size) for entry in entries}
 
-    normalized_query = _normalize(query)
-    
-    scores = {}
-    for choice in choices:
-        # For members, check both username and display name
-        if isinstance(choice, discord.Member):
-            username = choice.name
-            display_name = choice.display_name
-            
-            normalized_username = _normalize(username)
-            normalized_display_name = _normalize(display_name)
-
-            # Score based on the higher of the two matches
-            username_score = SequenceMatcher(None, normalized_query, normalized_username).ratio()
-            display_name_score = SequenceMatcher(None, normalized_query, normalized_display_name).ratio()
-            
-            scores[choice] = max(username_score, display_name_score)
-        else:
-            # For other types (channels, roles), use the name attribute
-            normalized_choice_name = _normalize(choice.name)
-            if not normalized_choice_name:
+        query_grams = _trigrams(query)
+        shared = Counter()
+        for gram in query_grams:
+            for entry in self._grams.get(gram, ()):
+                shared[entry] += 1
+
+        def possible(entry):
+            return possible_length(len(self._keys[entry]))
+
+        def overlap(entry):
+            # Dice coefficient; a padded name of length n has n + 1 trigrams
+            return 2 * shared[entry] / (len(query) + len(self._keys[entry]) + 2)
+
+        candidates = set(heapq.nlargest(MAX_CANDIDATES, filter(possible, shared), key=overlap))
+
+        start = bisect_left(self._sorted_keys, query)
+        for offset in range(start, min(start + MAX_CANDIDATES, len(self._sorted_keys))):
+            if not self._sorted_keys[offset].startswith(query):
+                break
+            candidates.add(self._by_key[offset])
+        return candidates
+
+    def best_match(self, query: str, threshold: float = 0.6) -> tuple:
+        """(best choice, its score) for query; the choice is None if nothing resembles it at all."""
+        normalized_query = _normalize(query)
+        if not normalized_query:
+            return None, 0.0
+        if normalized_query in self._exact:
+            return self.choices[self._exact[normalized_query]], 1.0
+
+        best_entry, best_score = None, 0.0
+        matcher = SequenceMatcher(None, normalized_query)
+        for entry in self._candidates(normalized_query, threshold):
+            matcher.set_seq2(self._keys[entry])
+            # quick_ratio() bounds ratio() from above and is much cheaper
+            if matcher.quick_ratio() < best_score:
                 continue
-            scores[choice] = SequenceMatcher(None, normalized_query, normalized_choice_name).ratio()
+            score = matcher.ratio()
+            # Ties go to the choice listed first
+            if score > best_score or (score == best_score and best_entry is not None and self._owners[entry] < self._owners[best_entry]):
+                best_entry, best_score = entry, score
+        if best_entry is None:
+            return None, 0.0
+        return self.choices[self._owners[best_entry]], best_score
+
+def _find_best_match(query: str, choices, threshold: float = 0.6):
+    """Find the best match for a query from a list of choices (or a prebuilt NameIndex) after normalizing names."""
+    index = choices if isinstance(choices, NameIndex) else NameIndex(choices or [])
+    if not len(index):
+        return None
 
-    if not scores:
+    best_choice, best_score = index.best_match(query, threshold)
+    if best_choice is None:
+        logger.warning(f"No suitable match found for '{query}'.")
         return None
 
-    best_choice = max(scores, key=scores.get)
-    best_score = scores[best_choice]
-    
     if best_score >= threshold:
-        name_to_log = best_choice.name if not isinstance(best_choice, discord.Member) else f"{best_choice.name} ({best_choice.display_name})"
-        logger.info(f"Found best match for '{query}': '{name_to_log}' with score {best_score}")
+        logger.info(f"Found best match for '{query}': '{_label(best_choice)}' with score {best_score}")
         return best_choice
-    
-    name_to_log = best_choice.name if not isinstance(best_choice, discord.Member) else f"{best_choice.name} ({best_choice.display_name})"
-    logger.warning(f"No suitable match found for '{query}'. Best match '{name_to_log}' had score {best_score}, which is below threshold {threshold}.")
+
+    logger.warning(f"No suitable match found for '{query}'. Best match '{_label(best_choice)}' had score {best_score}, which is below threshold {threshold}.")
     return None
 
-def get_channel_by_name(name: str, channels: list):
+def get_channel_by_name(name: str, channels):
     """Finds the best channel match from a list of channels."""
     return _find_best_match(name, channels)
 
-def get_category_by_name(name: str, categories: list):
+def get_category_by_name(name: str, categories):
     """Finds the best category match from a list of categories."""
     return _find_best_match(name, categories)
 
-def get_role_by_name(name: str, roles: list):
+def get_role_by_name(name: str, roles):
     """Finds the best role match from a list of roles."""
     return _find_best_match(name, roles)
 
-def get_member_by_name(name: str, members: list):
+def get_member_by_name(name: str, members):
     """Finds the best member match from a list of members."""
-    return _find_best_match(name, members)
\ No newline at end of file
+    return _find_best_match(name, members)
@@ -0,0 +1,103 @@
+import os
+import asyncio
+from typing import Optional
+from elasticsearch import AsyncElasticsearch
+from elasticsearch.helpers import async_streaming_bulk
+
+# A _bulk request is flushed when it reaches either limit
+BULK_MAX_CHUNK_BYTES = int(os.getenv("ES_BULK_MAX_CHUNK_BYTES", str(5 * 1024 * 1024)))
+BULK_MAX_CHUNK_DOCS = int(os.getenv("ES_BULK_MAX_CHUNK_DOCS", "1000"))
+# Retries for chunks rejected with 429 (exponential backoff)
+BULK_MAX_RETRIES = int(os.getenv("ES_BULK_MAX_RETRIES", "3"))
+BULK_INITIAL_BACKOFF_SECONDS = 2
+BULK_MAX_BACKOFF_SECONDS = 600
+MGET_BATCH_SIZE = int(os.getenv("ES_MGET_BATCH_SIZE", "1000"))
+# Per-item errors listed in a response; the rest are only counted
+MAX_REPORTED_ERRORS = 20
+
+
+def _bulk_action(index: str, op_type: str, document: dict) -> dict:
+    # The body goes under "_source" so fields such as "_index", "routing" or "pipeline" are indexed as data
+    # instead of being taken as bulk metadata; only "_id" and "_routing" are lifted out.
+    source = {key: value for key, value in document.items() if key not in ("_id", "_routing")}
+    action = {"_index": index, "_op_type": op_type, "_source": source}
+    for key in ("_id", "_routing"):
+        if key in document:
+            action[key] = document[key]
+    return action
+
+
+async def bulk_index(es_client: AsyncElasticsearch, index: str, documents: list, op_type: str = "index", refresh: Optional[str] = None) -> dict:
+    """
+    Index documents through _bulk, streamed as NDJSON in chunks bounded by ES_BULK_MAX_CHUNK_BYTES / _DOCS.
+    A document's "_id" (and "_routing") keys are used as metadata rather than indexed.
+    """
+    succeeded = 0
+    failed = 0
+    errors = []
+    pending = range(len(documents))  # positions still to send
+    for attempt in range(BULK_MAX_RETRIES + 1):
+        if attempt:
+            await asyncio.sleep(min(BULK_MAX_BACKOFF_SECONDS, BULK_INITIAL_BACKOFF_SECONDS * 2 ** (attempt - 1)))
+        # 429s are retried here rather than by the helper: without its retries it yields one result
+        # per action in the order sent, which is what ties each result to its document's position
+        positions = iter(pending)
+        retry = []
+        async for ok, item in async_streaming_bulk(
+            es_client,
+            (_bulk_action(index, op_type, documents[position]) for position in pending),
+            chunk_size=BULK_MAX_CHUNK_DOCS,
+            max_chunk_bytes=BULK_MAX_CHUNK_BYTES,
+            max_retries=0,
+            raise_on_error=False,
+            raise_on_exception=False,
+        ):
+            position = next(positions)
+            if ok:
+                succeeded += 1
+                continue
+            result = next(iter(item.values()))
+            if result.get("status") == 429 and attempt < BULK_MAX_RETRIES:
+                retry.append(position)
+                continue
+            failed += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append({"position": position, "_id": result.get("_id"), "status": result.get("status"), "error": result.get("error")})
+        if not retry:
+            break
+        pending = retry
+
+    if refresh in ("true", "wait_for") and succeeded:
+        await es_client.indices.refresh(index=index)
+
+    summary = {"total": len(documents), "succeeded": succeeded, "failed": failed}
+    if errors:
+        summary["errors"] = sorted(errors, key=lambda error: error["position"])
+    return summary
+
+
+async def mget(es_client: AsyncElasticsearch, index: str, ids: list, fields: Optional[list] = None) -> dict:
+    """Fetch documents by ID through _mget, in concurrent batches of ES_MGET_BATCH_SIZE."""
+    batches = [ids[start:start + MGET_BATCH_SIZE] for start in range(0, len(ids), MGET_BATCH_SIZE)]
+    source = fields if fields else True
+    responses = await asyncio.gather(*(es_client.mget(index=index, ids=batch, source=source) for batch in batches))
+
+    found = []
+    missing = []
+    errors = []
+    for response in responses:
+        for doc in response["docs"]:
+            if "error" in doc:
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    errors.append({"_id": doc.get("_id"), "error": doc["error"]})
+            elif doc.get("found"):
+                found.append({"_id": doc["_id"], "_source": doc.get("_source")})
+            else:
+                missing.append(doc.get("_id"))
+
+    result = {"found": found}
+    if missing:
+        result["missing"] = missing
+    if errors:
+        result["errors"] = errors
+    return result
@@ -0,0 +1,81 @@
+import os
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from elasticsearch import AsyncElasticsearch
+
+logger = logging.getLogger(__name__)
+
+# Distinct (ES_URL, API key, verify_certs) clients kept open at once (least recently used is closed)
+CLIENT_POOL_MAX_SIZE = int(os.getenv("ES_CLIENT_POOL_MAX_SIZE", "16"))
+# Clients unused for longer than this are closed
+CLIENT_POOL_MAX_IDLE_SECONDS = float(os.getenv("ES_CLIENT_POOL_MAX_IDLE_SECONDS", "600"))
+# Per-request timeout; long operations should use the background (wait_for_completion=false) variants
+REQUEST_TIMEOUT_SECONDS = float(os.getenv("ES_REQUEST_TIMEOUT_SECONDS", "60"))
+
+
+class PooledClient:
+    def __init__(self, client: AsyncElasticsearch):
+        self.client = client
+        self.last_used = time.monotonic()
+        self.in_use = 0
+
+
+class ClientPool:
+    """
+    AsyncElasticsearch clients keyed on the credential set so keep-alive connections are reused across tool calls.
+    Clients are only closed once no call is using them.
+    """
+
+    def __init__(self, max_size: int = CLIENT_POOL_MAX_SIZE, max_idle_seconds: float = CLIENT_POOL_MAX_IDLE_SECONDS):
+        self.max_size = max_size
+        self.max_idle_seconds = max_idle_seconds
+        self._clients = OrderedDict()  # key -> PooledClient
+
+    async def _close(self, entry: PooledClient):
+        try:
+            await entry.client.close()
+        except Exception as e:
+            logger.warning(f"Error closing Elasticsearch client: {e}")
+
+    def _evict(self) -> list:
+        """Pop idle and excess clients that aren't in use. The caller closes what is returned."""
+        now = time.monotonic()
+        evicted = []
+        for key, entry in list(self._clients.items()):
+            if entry.in_use == 0 and now - entry.last_used > self.max_idle_seconds:
+                evicted.append(self._clients.pop(key))
+        for key, entry in list(self._clients.items()):
+            if len(self._clients) <= self.max_size:
+                break
+            if entry.in_use == 0:
+                evicted.append(self._clients.pop(key))
+        return evicted
+
+    @asynccontextmanager
+    async def client(self, es_url: str, api_key: str, verify_certs: bool):
+        """Borrow the client for these credentials for the duration of the block."""
+        key = (es_url, api_key, verify_certs)
+        entry = self._clients.pop(key, None)
+        if entry is None:
+            entry = PooledClient(AsyncElasticsearch(hosts=[es_url], api_key=api_key, verify_certs=verify_certs, request_timeout=REQUEST_TIMEOUT_SECONDS))
+            logger.info(f"Created Elasticsearch client for {es_url}")
+        self._clients[key] = entry
+        entry.in_use += 1
+        entry.last_used = time.monotonic()
+        try:
+            yield entry.client
+        finally:
+            entry.in_use -= 1
+            entry.last_used = time.monotonic()
+            evicted = self._evict()
+            await asyncio.gather(*(self._close(old) for old in evicted))
+
+    async def close_all(self):
+        entries, self._clients = list(self._clients.values()), OrderedDict()
+        await asyncio.gather(*(self._close(entry) for entry in entries))
+
+
+client_pool = ClientPool()
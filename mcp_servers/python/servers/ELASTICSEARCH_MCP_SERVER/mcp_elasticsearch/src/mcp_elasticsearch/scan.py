@@ -0,0 +1,187 @@
+import os
+import json
+import logging
+from collections import Counter
+from typing import Optional
+from elasticsearch import AsyncElasticsearch
+
+logger = logging.getLogger(__name__)
+
+# How long a point in time stays open between pages
+PIT_KEEP_ALIVE = os.getenv("ES_PIT_KEEP_ALIVE", "2m")
+SCAN_PAGE_SIZE = int(os.getenv("ES_SCAN_PAGE_SIZE", "1000"))
+# Hard cap on hits read by one digest scan
+SCAN_MAX_HITS = int(os.getenv("ES_SCAN_MAX_HITS", "100000"))
+# Hits returned per call in pages mode
+SCAN_MAX_PAGE_HITS = int(os.getenv("ES_SCAN_MAX_PAGE_HITS", "200"))
+DIGEST_TOP_VALUES = 10
+DIGEST_SAMPLE_HITS = 5
+# Distinct values tracked per field before new ones stop being counted
+DIGEST_MAX_DISTINCT = 1000
+
+
+def _flatten(source: dict, prefix: str = "") -> dict:
+    """Dotted field names to scalar values (lists of scalars are kept as lists)."""
+    flat = {}
+    for key, value in source.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{name}."))
+        else:
+            flat[name] = value
+    return flat
+
+
+class FieldDigest:
+    def __init__(self):
+        self.count = 0
+        self.min = None
+        self.max = None
+        self.total = 0.0
+        self.numeric = 0
+        self.values = Counter()
+        self.overflow = False
+
+    def add(self, value):
+        if value is None:
+            return
+        self.count += 1
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            self.numeric += 1
+            self.total += value
+            self.min = value if self.min is None else min(self.min, value)
+            self.max = value if self.max is None else max(self.max, value)
+            return
+        if isinstance(value, (dict, list)):
+            value = json.dumps(value, sort_keys=True, default=str)
+        if value in self.values or len(self.values) < DIGEST_MAX_DISTINCT:
+            self.values[value] += 1
+        else:
+            self.overflow = True
+
+    def summary(self) -> dict:
+        summary = {"count": self.count}
+        if self.numeric:
+            summary.update({"min": self.min, "max": self.max, "mean": round(self.total / self.numeric, 6)})
+        if self.values:
+            summary["distinct"] = f">{DIGEST_MAX_DISTINCT}" if self.overflow else len(self.values)
+            summary["top_values"] = self.values.most_common(DIGEST_TOP_VALUES)
+        return summary
+
+
+class HitDigest:
+    """Bounded summary of any number of hits: per-field counts, ranges and top values plus a few samples."""
+
+    def __init__(self):
+        self.scanned = 0
+        self.fields = {}
+        self.sample = []
+
+    def add(self, hits: list):
+        for hit in hits:
+            self.scanned += 1
+            if len(self.sample) < DIGEST_SAMPLE_HITS:
+                self.sample.append({"_id": hit.get("_id"), "_source": hit.get("_source")})
+            for name, value in _flatten(hit.get("_source") or {}).items():
+                digest = self.fields.setdefault(name, FieldDigest())
+                for item in value if isinstance(value, list) else [value]:
+                    digest.add(item)
+
+    def summary(self) -> dict:
+        return {
+            "scanned": self.scanned,
+            "fields": {name: digest.summary() for name, digest in sorted(self.fields.items())},
+            "sample": self.sample,
+        }
+
+
+def encode_cursor(pit_id: str, search_after: list, request: dict) -> str:
+    return json.dumps({"pit_id": pit_id, "search_after": search_after, "request": request}, separators=(",", ":"))
+
+
+def decode_cursor(cursor: str) -> dict:
+    try:
+        state = json.loads(cursor)
+        return {"pit_id": state["pit_id"], "search_after": state["search_after"], "request": state["request"]}
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor; pass the 'cursor' value returned by the previous scan_documents call unchanged")
+
+
+async def _search_page(es_client: AsyncElasticsearch, pit_id: str, request: dict, size: int, search_after: Optional[list], track_total_hits: bool):
+    response = await es_client.search(
+        pit={"id": pit_id, "keep_alive": PIT_KEEP_ALIVE},
+        query=request["query"],
+        sort=request["sort"],
+        source=request["fields"] or False,
+        size=size,
+        search_after=search_after,
+        track_total_hits=track_total_hits,
+    )
+    return response.get("pit_id", pit_id), response["hits"]
+
+
+async def _close_pit(es_client: AsyncElasticsearch, pit_id: str):
+    try:
+        await es_client.close_point_in_time(id=pit_id)
+    except Exception as e:
+        logger.warning(f"Failed to close point in time: {e}")
+
+
+async def scan_documents(es_client: AsyncElasticsearch, index: Optional[str] = None, query: Optional[dict] = None, fields: Optional[list] = None,
+                         sort: Optional[list] = None, mode: str = "digest", page_size: Optional[int] = None, max_hits: Optional[int] = None,
+                         cursor: Optional[str] = None) -> dict:
+    """
+    Walk every hit of a query with a point in time and search_after.
+    digest mode reads up to max_hits and returns a HitDigest summary; pages mode returns one page and a cursor for the next.
+    """
+    if cursor:
+        state = decode_cursor(cursor)
+        pit_id, search_after, request = state["pit_id"], state["search_after"], state["request"]
+    else:
+        if not index:
+            raise ValueError("'index' is required unless a cursor is given")
+        # _shard_doc is the cheapest total order within a point in time
+        request = {"query": query or {"match_all": {}}, "sort": sort or [{"_shard_doc": "asc"}], "fields": fields or []}
+        pit_id = (await es_client.open_point_in_time(index=index, keep_alive=PIT_KEEP_ALIVE))["id"]
+        search_after = None
+
+    if mode == "pages":
+        size = min(page_size or SCAN_MAX_PAGE_HITS, SCAN_MAX_PAGE_HITS)
+        try:
+            pit_id, hits = await _search_page(es_client, pit_id, request, size, search_after, track_total_hits=not cursor)
+        except BaseException:
+            # A point in time opened by this call has no cursor pointing at it yet; one from a cursor stays open for a retry
+            if not cursor:
+                await _close_pit(es_client, pit_id)
+            raise
+        page = hits["hits"]
+        result = {"hits": [{"_id": hit["_id"], "_source": hit.get("_source")} for hit in page]}
+        if "total" in hits:
+            result["total"] = hits["total"]
+        if len(page) == size:
+            result["cursor"] = encode_cursor(pit_id, page[-1]["sort"], request)
+        else:
+            result["cursor"] = None
+            await _close_pit(es_client, pit_id)
+        return result
+
+    limit = min(max_hits or SCAN_MAX_HITS, SCAN_MAX_HITS)
+    size = min(page_size or SCAN_PAGE_SIZE, SCAN_PAGE_SIZE)
+    digest = HitDigest()
+    total = None
+    try:
+        while digest.scanned < limit:
+            pit_id, hits = await _search_page(es_client, pit_id, request, min(size, limit - digest.scanned), search_after, track_total_hits=total is None)
+            total = hits.get("total", total)
+            page = hits["hits"]
+            if not page:
+                break
+            digest.add(page)
+            search_after = page[-1]["sort"]
+    finally:
+        await _close_pit(es_client, pit_id)
+
+    summary = digest.summary()
+    summary["total"] = total
+    summary["truncated"] = digest.scanned >= limit and not (total and total.get("relation") == "eq" and total.get("value") == digest.scanned)
+    return summary
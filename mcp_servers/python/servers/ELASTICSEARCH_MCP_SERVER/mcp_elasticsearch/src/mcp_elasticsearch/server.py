@@ -1,15 +1,19 @@
 import asyncio
 import logging
 import warnings
-from elasticsearch import Elasticsearch
 from mcp.server import Server
 from mcp.types import Tool, TextContent
+from elasticsearch import AsyncElasticsearch
+from .client_pool import client_pool
+from .scan import scan_documents
+from .batch import bulk_index, mget
+from .slimming import MAX_SEARCH_HITS, apply_defaults, cap_search_size, summarize_indices, render_result
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def get_es_client(__credentials__: dict) -> Elasticsearch:
-    """Create an Elasticsearch client from credentials."""
+def get_es_credentials(__credentials__: dict) -> tuple:
+    """Validate credentials and return the (ES_URL, API key, verify_certs) key used to pick a pooled client."""
     if not __credentials__:
         raise ValueError("Missing credentials")
 
@@ -30,11 +34,7 @@ def get_es_client(__credentials__: dict) -> Elasticsearch:
         except ImportError:
             pass
 
-    return Elasticsearch(
-        hosts=[es_url],
-        api_key=api_key,
-        verify_certs=verify_certs
-    )
+    return es_url, api_key, verify_certs
 
 app = Server("mcp-elasticsearch")
 
@@ -51,8 +51,8 @@ async def list_tools() -> list[Tool]:
         ),
         Tool(
             name="get_index",
-            description="Retrieves detailed information about one or more indices, including mappings and settings. Example: get_index(index='my-index')",
-            inputSchema={"type": "object", "properties": {"index": {"type": "string"}}, "required": ["index"]}
+            description="Retrieves information about one or more indices. By default returns a compact summary (aliases, shard and replica counts, field types); pass summary=false for the raw mappings and settings. Example: get_index(index='my-index')",
+            inputSchema={"type": "object", "properties": {"index": {"type": "string"}, "summary": {"type": "boolean", "default": True}}, "required": ["index"]}
         ),
         Tool(
             name="create_index",
@@ -68,7 +68,39 @@ async def list_tools() -> list[Tool]:
         Tool(
             name="search_documents",
             description="Searches for documents within an index. Can accept a simple query string or a full Elasticsearch Query DSL. Simple example: search_documents(index='my-index', body={'query': 'hello world'}). Advanced example: search_documents(index='my-index', body={'query': {'match': {'field_name': 'hello'}}})",
-            inputSchema={"type": "object", "properties": {"index": {"type": "string"}, "body": {"type": "object"}}, "required": ["index"]}
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "index": {"type": "string"},
+                    "body": {"type": "object"},
+                    "fields": {"type": "array", "items": {"type": "string"}, "description": "_source fields to return; list only what is needed."},
+                    "filter_path": {"type": "string", "description": "Comma-separated response paths to keep, overriding the default."}
+                },
+                "required": ["index"]
+            }
+        ),
+        Tool(
+            name="scan_documents",
+            description=(
+                "Streams through every document matching a query using a point in time and search_after, instead of paging with repeated search_documents calls. "
+                "mode='digest' (default) reads up to max_hits documents and returns a compact summary: per-field counts, numeric min/max/mean, top values and a few sample documents. "
+                "mode='pages' returns one page of hits plus a 'cursor'; pass the cursor back (without index/query) to get the next page until the cursor is null. "
+                "Always list the needed source fields in 'fields' to keep responses small. "
+                "Example: scan_documents(index='logs', query={'term': {'level': 'error'}}, fields=['service', 'status'])"
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "index": {"type": "string"},
+                    "query": {"type": "object", "description": "Query DSL; defaults to match_all."},
+                    "fields": {"type": "array", "items": {"type": "string"}, "description": "_source fields to return. Omit to return only document IDs."},
+                    "sort": {"type": "array", "description": "Sort clauses; defaults to index order."},
+                    "mode": {"type": "string", "enum": ["digest", "pages"], "default": "digest"},
+                    "page_size": {"type": "integer", "description": "Hits per page."},
+                    "max_hits": {"type": "integer", "description": "Maximum documents read in digest mode."},
+                    "cursor": {"type": "string", "description": "Cursor returned by the previous pages call."}
+                }
+            }
         ),
         Tool(
             name="index_document",
@@ -80,6 +112,33 @@ async def list_tools() -> list[Tool]:
             description="Retrieves a specific document by its ID from an index. Example: get_document(index='my-index', id='1')",
             inputSchema={"type": "object", "properties": {"index": {"type": "string"}, "id": {"type": "string"}}, "required": ["index", "id"]}
         ),
+        Tool(
+            name="bulk_index",
+            description="Indexes many documents in one call using the _bulk API, chunked automatically. A document's '_id' key, if present, is used as its ID. Returns success/failure counts and per-document errors. Example: bulk_index(index='my-index', documents=[{'_id': '1', 'title': 'A'}, {'title': 'B'}])",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "index": {"type": "string"},
+                    "documents": {"type": "array", "items": {"type": "object"}},
+                    "op_type": {"type": "string", "enum": ["index", "create"], "default": "index", "description": "'create' fails for IDs that already exist."},
+                    "refresh": {"type": "string", "enum": ["false", "true", "wait_for"], "default": "false"}
+                },
+                "required": ["index", "documents"]
+            }
+        ),
+        Tool(
+            name="mget",
+            description="Retrieves many documents by ID in one call using the _mget API. Returns found documents and the IDs that were missing. Example: mget(index='my-index', ids=['1', '2', '3'], fields=['title'])",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "index": {"type": "string"},
+                    "ids": {"type": "array", "items": {"type": "string"}},
+                    "fields": {"type": "array", "items": {"type": "string"}, "description": "_source fields to return; omit for the whole document."}
+                },
+                "required": ["index", "ids"]
+            }
+        ),
         Tool(
             name="delete_document",
             description="Deletes a specific document by its ID from an index. Example: delete_document(index='my-index', id='1')",
@@ -87,8 +146,13 @@ async def list_tools() -> list[Tool]:
         ),
         Tool(
             name="delete_by_query",
-            description="Deletes all documents from an index that match a specific query. Example: delete_by_query(index='my-index', body={'query': {'match': {'user.id': 'kimchy'}}})",
-            inputSchema={"type": "object", "properties": {"index": {"type": "string"}, "body": {"type": "object"}}, "required": ["index", "body"]}
+            description="Deletes all documents from an index that match a specific query. For large deletes pass wait_for_completion=false to run it as a background task and poll it with get_task. Example: delete_by_query(index='my-index', body={'query': {'match': {'user.id': 'kimchy'}}})",
+            inputSchema={"type": "object", "properties": {"index": {"type": "string"}, "body": {"type": "object"}, "wait_for_completion": {"type": "boolean", "default": True}}, "required": ["index", "body"]}
+        ),
+        Tool(
+            name="get_task",
+            description="Returns the status of a background task, such as a delete_by_query started with wait_for_completion=false. Example: get_task(task_id='oTUltX4IQMOUUVeiohTt8A:12345')",
+            inputSchema={"type": "object", "properties": {"task_id": {"type": "string"}}, "required": ["task_id"]}
         ),
         # Cluster Tools
         Tool(
@@ -98,7 +162,7 @@ async def list_tools() -> list[Tool]:
         ),
         Tool(
             name="get_cluster_stats",
-            description="Returns a comprehensive overview of cluster statistics, including node counts, index metrics, and memory usage.",
+            description="Returns an overview of cluster statistics: node counts and versions, index, document and shard counts, store size, JVM memory and disk usage.",
             inputSchema={"type": "object", "properties": {}}
         ),
         # Alias Tools
@@ -131,19 +195,29 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
     
     __credentials__ = arguments.pop("__credentials__", None)
     arguments.pop("server_credentials", None)  # Remove the extra credentials argument
-    es_client = get_es_client(__credentials__=__credentials__)
+    es_credentials = get_es_credentials(__credentials__=__credentials__)
+
+    async with client_pool.client(*es_credentials) as es_client:
+        return await execute_tool(es_client, name, arguments)
 
+async def execute_tool(es_client: AsyncElasticsearch, name: str, arguments: dict) -> list[TextContent]:
     result = None
+    notes = []
+    apply_defaults(name, arguments)
     try:
         # Index Tools
         if name == "list_indices":
-            result = es_client.cat.indices(**arguments)
+            result = await es_client.cat.indices(**arguments)
         elif name == "get_index":
-            result = es_client.indices.get(**arguments)
+            if arguments.pop("summary", True):
+                arguments.setdefault("filter_path", "*.aliases,*.mappings,*.settings.index.number_of_shards,*.settings.index.number_of_replicas")
+                result = summarize_indices((await es_client.indices.get(**arguments)).body)
+            else:
+                result = await es_client.indices.get(**arguments)
         elif name == "create_index":
-            result = es_client.indices.create(**arguments)
+            result = await es_client.indices.create(**arguments)
         elif name == "delete_index":
-            result = es_client.indices.delete(**arguments)
+            result = await es_client.indices.delete(**arguments)
         # Document Tools
         elif name == "search_documents":
             if "body" in arguments and "query" in arguments["body"] and isinstance(arguments["body"]["query"], str):
@@ -156,48 +230,64 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
                             }
                         }
                     }
-            result = es_client.search(**arguments)
+            fields = arguments.pop("fields", None)
+            if fields:
+                arguments["source_includes"] = fields
+            if cap_search_size(arguments):
+                notes.append(f"(size capped at {MAX_SEARCH_HITS} hits; use scan_documents for larger result sets)")
+            result = await es_client.search(**arguments)
+        elif name == "scan_documents":
+            result = await scan_documents(es_client, **arguments)
         elif name == "index_document":
-            result = es_client.index(**arguments)
+            result = await es_client.index(**arguments)
         elif name == "get_document":
-            result = es_client.get(**arguments)
+            result = await es_client.get(**arguments)
+        elif name == "bulk_index":
+            result = await bulk_index(es_client, **arguments)
+        elif name == "mget":
+            result = await mget(es_client, **arguments)
         elif name == "delete_document":
-            result = es_client.delete(**arguments)
+            result = await es_client.delete(**arguments)
         elif name == "delete_by_query":
-            result = es_client.delete_by_query(**arguments)
+            result = await es_client.delete_by_query(**arguments)
+        elif name == "get_task":
+            result = await es_client.tasks.get(**arguments)
         # Cluster Tools
         elif name == "get_cluster_health":
-            result = es_client.cluster.health(**arguments)
+            result = await es_client.cluster.health(**arguments)
         elif name == "get_cluster_stats":
-            result = es_client.cluster.stats(**arguments)
+            result = await es_client.cluster.stats(**arguments)
         # Alias Tools
         elif name == "list_aliases":
-            result = es_client.cat.aliases(**arguments)
+            result = await es_client.cat.aliases(**arguments)
         elif name == "get_alias":
-            result = es_client.indices.get_alias(**arguments)
+            result = await es_client.indices.get_alias(**arguments)
         elif name == "put_alias":
-            result = es_client.indices.put_alias(**arguments)
+            result = await es_client.indices.put_alias(**arguments)
         elif name == "delete_alias":
-            result = es_client.indices.delete_alias(**arguments)
+            result = await es_client.indices.delete_alias(**arguments)
         else:
             raise ValueError(f"Unknown tool: {name}")
     except Exception as e:
         logger.error(f"Error calling tool {name}: {e}")
         return [TextContent(type="text", text=f"Error: {str(e)}")]
 
-    return [TextContent(type="text", text=str(result))]
+    return [TextContent(type="text", text="\n".join([render_result(result), *notes]))]
 
 async def main():
     """Main entry point to run the MCP server."""
     from mcp.server.stdio import stdio_server
 
     logger.info("Starting Elasticsearch MCP server...")
-    async with stdio_server() as (read_stream, write_stream):
-        await app.run(
-            read_stream,
-            write_stream,
-            app.create_initialization_options()
-        )
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await app.run(
+                read_stream,
+                write_stream,
+                app.create_initialization_options()
+            )
+    finally:
+        await client_pool.close_all()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
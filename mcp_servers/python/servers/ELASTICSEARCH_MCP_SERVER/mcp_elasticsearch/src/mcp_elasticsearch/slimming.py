@@ -0,0 +1,91 @@
+import os
+import json
+
+# Upper bound on hits returned by search_documents, whatever size the caller asks for
+MAX_SEARCH_HITS = int(os.getenv("ES_MAX_SEARCH_HITS", "50"))
+# Hard cap on the text of any tool result
+MAX_RESPONSE_CHARS = int(os.getenv("ES_MAX_RESPONSE_CHARS", "50000"))
+
+# Applied when the caller doesn't pass its own filter_path
+DEFAULT_FILTER_PATHS = {
+    "search_documents": "took,timed_out,hits.total,hits.max_score,hits.hits._index,hits.hits._id,hits.hits._score,hits.hits._source,hits.hits.highlight,hits.hits.fields,hits.hits.sort,hits.hits.inner_hits,aggregations,suggest",
+    "index_document": "_index,_id,_version,result",
+    "get_document": "_index,_id,_version,found,_source",
+    "delete_document": "_index,_id,_version,result",
+    "delete_by_query": "took,timed_out,total,deleted,version_conflicts,failures,task",
+    "create_index": "acknowledged,index",
+    "get_task": "completed,task.action,task.description,task.status,task.running_time_in_nanos,response.total,response.deleted,response.failures,error",
+    # Enough of cluster.stats for an overview; the full response is tens of KB
+    "get_cluster_stats": ",".join([
+        "cluster_name", "status",
+        "indices.count", "indices.docs.count", "indices.store.size_in_bytes", "indices.shards.total", "indices.shards.primaries",
+        "nodes.count", "nodes.versions", "nodes.jvm.mem", "nodes.fs.total_in_bytes", "nodes.fs.available_in_bytes",
+    ]),
+}
+# Default columns for the _cat tools
+DEFAULT_CAT_COLUMNS = {
+    "list_indices": "health,status,index,docs.count,store.size",
+    "list_aliases": "alias,index,is_write_index",
+}
+
+
+def apply_defaults(name: str, arguments: dict):
+    """Fill in response projections the caller didn't specify."""
+    if name in DEFAULT_FILTER_PATHS:
+        arguments.setdefault("filter_path", DEFAULT_FILTER_PATHS[name])
+    if name in DEFAULT_CAT_COLUMNS:
+        arguments.setdefault("h", DEFAULT_CAT_COLUMNS[name])
+        arguments.setdefault("v", True)
+
+
+def cap_search_size(arguments: dict) -> bool:
+    """Clamp the requested hit count to MAX_SEARCH_HITS. Returns True when it was lowered."""
+    capped = False
+    for container in (arguments.get("body") or {}, arguments):
+        if container.get("size") is None:
+            continue
+        # Models often send the size as a string ("100")
+        try:
+            size = int(container["size"])
+        except (TypeError, ValueError):
+            raise ValueError(f"'size' must be an integer, got {container['size']!r}")
+        if size > MAX_SEARCH_HITS:
+            size = MAX_SEARCH_HITS
+            capped = True
+        container["size"] = size
+    return capped
+
+
+def _mapping_fields(properties: dict, prefix: str = "") -> dict:
+    """Flatten a mapping's properties into {dotted.field: type}."""
+    fields = {}
+    for name, spec in properties.items():
+        path = f"{prefix}{name}"
+        if "properties" in spec:
+            fields.update(_mapping_fields(spec["properties"], f"{path}."))
+        else:
+            fields[path] = spec.get("type", "object")
+    return fields
+
+
+def summarize_indices(body: dict) -> dict:
+    """Compact view of indices.get: aliases, shard/replica counts and field types instead of raw mappings and settings."""
+    summary = {}
+    for index, info in body.items():
+        settings = info.get("settings", {}).get("index", {})
+        summary[index] = {
+            "aliases": sorted(info.get("aliases", {})),
+            "shards": settings.get("number_of_shards"),
+            "replicas": settings.get("number_of_replicas"),
+            "fields": _mapping_fields(info.get("mappings", {}).get("properties", {})),
+        }
+    return summary
+
+
+def render_result(result) -> str:
+    """Compact JSON for API responses and tool summaries, text for _cat output, capped at MAX_RESPONSE_CHARS."""
+    body = getattr(result, "body", result)
+    text = body if isinstance(body, str) else json.dumps(body, separators=(",", ":"), default=str)
+    if len(text) > MAX_RESPONSE_CHARS:
+        text = f"{text[:MAX_RESPONSE_CHARS]}\n... [truncated {len(text) - MAX_RESPONSE_CHARS} characters; narrow the request with filter_path, fields or a smaller size]"
+    return text
@@ -0,0 +1,184 @@
+import os
+import re
+import time
+import hashlib
+import logging
+import tempfile
+import threading
+from typing import Optional
+from collections import OrderedDict
+from .pool import config_key
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows; concurrent bumps there may be counted once
+    fcntl = None
+
+logger = logging.getLogger("mysql_mcp_server")
+
+# Result caching is opt-in
+QUERY_CACHE_ENABLED = os.getenv("MYSQL_QUERY_CACHE_ENABLED", "false").lower() == "true"
+QUERY_CACHE_TTL_SECONDS = float(os.getenv("MYSQL_QUERY_CACHE_TTL_SECONDS", "60"))
+QUERY_CACHE_MAX_ENTRIES = int(os.getenv("MYSQL_QUERY_CACHE_MAX_ENTRIES", "256"))
+QUERY_CACHE_MAX_BYTES = int(os.getenv("MYSQL_QUERY_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+# Schema descriptions are always cached
+SCHEMA_CACHE_TTL_SECONDS = float(os.getenv("MYSQL_SCHEMA_CACHE_TTL_SECONDS", "300"))
+# Per-credential-set generation files shared by every server process on the host, so a write
+# through one process invalidates what the others cached
+CACHE_GENERATION_DIR = os.getenv("MYSQL_CACHE_GENERATION_DIR", os.path.join(tempfile.gettempdir(), "mysql_mcp_server_cache"))
+
+_READ_ONLY_PREFIXES = ("SELECT", "SHOW", "DESCRIBE", "DESC", "EXPLAIN")
+_DDL_PREFIXES = ("CREATE", "ALTER", "DROP", "RENAME", "TRUNCATE")
+# Reads that take locks, write files or are not repeatable
+_UNCACHEABLE = re.compile(r"\b(FOR\s+UPDATE|LOCK\s+IN\s+SHARE\s+MODE|INTO|SLEEP|RAND|UUID|NOW|CURRENT_TIMESTAMP|SYSDATE|LAST_INSERT_ID|FOUND_ROWS)\b", re.IGNORECASE)
+
+
+# A quoted string or identifier (kept as is), or a run of whitespace
+_QUOTED_OR_SPACE = re.compile(r"""('(?:[^'\\]|\\.|'')*'|"(?:[^"\\]|\\.|"")*"|`(?:[^`]|``)*`)|\s+""", re.DOTALL)
+
+
+def normalize_sql(query: str) -> str:
+    """Collapse whitespace outside quotes and drop a trailing semicolon. Literals are left untouched."""
+    return _QUOTED_OR_SPACE.sub(lambda match: match.group(1) or " ", query).strip().rstrip(";").strip()
+
+
+def is_read_only(query: str) -> bool:
+    normalized = normalize_sql(query)
+    first_word = normalized.split(" ", 1)[0].upper()
+    return first_word in _READ_ONLY_PREFIXES and ";" not in normalized
+
+
+def is_ddl(query: str) -> bool:
+    return normalize_sql(query).split(" ", 1)[0].upper() in _DDL_PREFIXES
+
+
+def is_cacheable(query: str) -> bool:
+    return is_read_only(query) and not _UNCACHEABLE.search(query)
+
+
+class QueryCache:
+    """
+    TTL + size-bounded LRU cache of rendered read-only query results, keyed on credentials and SQL text.
+    Each entry records the credential set's generation from before its query ran. invalidate() bumps the
+    generation in a file under CACHE_GENERATION_DIR, which retires the entries of every process at once.
+    """
+
+    def __init__(self, name: str = "query", ttl_seconds: float = QUERY_CACHE_TTL_SECONDS, max_entries: int = QUERY_CACHE_MAX_ENTRIES, max_bytes: int = QUERY_CACHE_MAX_BYTES, enabled: bool = QUERY_CACHE_ENABLED):
+        self.name = name
+        self.enabled = enabled
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # (credentials, sql) -> (result_text, size, stored_at, generation)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _key(self, config: dict, query: str) -> tuple:
+        return (config_key(config), normalize_sql(query))
+
+    def _generation_path(self, credentials: tuple) -> str:
+        digest = hashlib.sha256(repr(credentials).encode("utf-8")).hexdigest()[:32]
+        return os.path.join(CACHE_GENERATION_DIR, f"{self.name}-{digest}")
+
+    @staticmethod
+    def _read_generation(path: str) -> int:
+        try:
+            with open(path, "rb") as f:
+                return int(f.read() or 0)
+        except FileNotFoundError:
+            return 0
+        except ValueError:
+            return 0  # not written by this version; the next bump replaces it
+
+    def generation(self, config: dict) -> Optional[int]:
+        """Current generation of the credential set, or None if it can't be read."""
+        try:
+            return self._read_generation(self._generation_path(config_key(config)))
+        except OSError as e:
+            logger.warning(f"Cannot read cache generation, not caching: {e}")
+            return None
+
+    def _bump(self, credentials: tuple):
+        path = self._generation_path(credentials)
+        try:
+            os.makedirs(CACHE_GENERATION_DIR, exist_ok=True)
+            # The lock serializes bumps from every process and thread (it is released when the file closes);
+            # the counter is replaced atomically so readers never see a partial write
+            with open(f"{path}.lock", "ab") as lock:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_EX)
+                tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(str(self._read_generation(path) + 1).encode("ascii"))
+                os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Cannot bump cache generation; other server processes may serve stale results: {e}")
+
+    def _remove(self, key):
+        _, size, _, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def get(self, config: dict, query: str):
+        key = self._key(config, query)
+        generation = self.generation(config)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[2] <= self.ttl_seconds and generation is not None and entry[3] == generation:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+
+    def put(self, config: dict, query: str, result_text: str, generation: Optional[int]):
+        """Store a result; generation is self.generation(config) as read before the query ran."""
+        size = len(result_text.encode("utf-8"))
+        if size > self.max_bytes or generation is None:
+            return
+        key = self._key(config, query)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (result_text, size, time.monotonic(), generation)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, config: dict):
+        """Drop every entry cached for this credential set, here and in the other server processes."""
+        if not self.enabled:
+            return
+        credentials = config_key(config)
+        self._bump(credentials)
+        with self._lock:
+            stale = [key for key in self._entries if key[0] == credentials]
+            for key in stale:
+                self._remove(key)
+            if stale:
+                self.invalidations += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+query_cache = QueryCache()
+schema_cache = QueryCache("schema", ttl_seconds=SCHEMA_CACHE_TTL_SECONDS, enabled=True)
@@ -0,0 +1,93 @@
+import os
+import asyncio
+import logging
+import functools
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from mysql.connector import Error
+from .pool import pools
+
+logger = logging.getLogger("mysql_mcp_server")
+
+# Worker threads running blocking driver calls off the event loop
+MAX_WORKERS = int(os.getenv("MYSQL_MAX_WORKERS", "8"))
+# Wall-clock limit per query; overrunning queries are killed server-side
+QUERY_TIMEOUT_SECONDS = float(os.getenv("MYSQL_QUERY_TIMEOUT_SECONDS", "30"))
+
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="mysql-worker")
+
+
+class QueryTimeoutError(Exception):
+    """Raised when a query runs past QUERY_TIMEOUT_SECONDS."""
+
+
+async def run_blocking(func, *args, **kwargs):
+    """Run a blocking function on the worker pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(func, *args, **kwargs))
+
+
+def _kill_query(config: dict, connection_id: int):
+    with pools.connection(config) as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(f"KILL QUERY {int(connection_id)}")
+
+
+class QueryState:
+    """
+    Shared by a run_query job and its timeout handler. A KILL QUERY is only sent while the job still
+    holds its connection, and a timed-out job closes the connection instead of pooling it, so the kill
+    can never reach a statement another caller runs on the same connection later.
+    """
+
+    def __init__(self):
+        self.connection_id = None
+        self._lock = threading.Lock()
+        self._finished = False
+        self._timed_out = False
+
+    @contextmanager
+    def connection(self, config: dict):
+        """Borrow a pooled connection for the job and record its id for KILL QUERY."""
+        with pools.connection(config, discard_if=self._finish) as conn:
+            self.connection_id = conn.connection_id
+            yield conn
+
+    def _finish(self) -> bool:
+        """Called as the job gives its connection back. Returns True when it timed out and must be discarded."""
+        with self._lock:
+            self._finished = True
+            return self._timed_out
+
+    def time_out(self):
+        """The connection id to KILL, or None when the job is already done with its connection (or never got one)."""
+        with self._lock:
+            self._timed_out = True
+            return None if self._finished else self.connection_id
+
+
+async def run_query(config: dict, func, *args, timeout: float = QUERY_TIMEOUT_SECONDS):
+    """
+    Run func(query_state, *args) on the worker pool with a timeout.
+    func must borrow its connection through query_state.connection(config) so the query can be killed on timeout.
+    """
+    query_state = QueryState()
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(_executor, functools.partial(func, query_state, *args))
+    try:
+        return await asyncio.wait_for(future, timeout=timeout)
+    except asyncio.TimeoutError:
+        connection_id = query_state.time_out()
+        if connection_id is not None:
+            logger.warning(f"Query on connection {connection_id} exceeded {timeout}s, sending KILL QUERY")
+            try:
+                # The default executor is used so the kill is not queued behind busy workers
+                await loop.run_in_executor(None, _kill_query, config, connection_id)
+            except Error as e:
+                logger.error(f"Failed to kill query on connection {connection_id}: {str(e)}")
+        raise QueryTimeoutError(f"Query exceeded the {timeout}s time limit and was cancelled")
+
+
+def shutdown():
+    _executor.shutdown(wait=False, cancel_futures=True)
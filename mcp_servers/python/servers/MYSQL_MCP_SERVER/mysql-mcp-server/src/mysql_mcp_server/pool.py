@@ -0,0 +1,167 @@
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Optional
+from mysql.connector import connect, Error
+
+logger = logging.getLogger("mysql_mcp_server")
+
+# Idle connections kept per credential set
+POOL_MAX_SIZE = int(os.getenv("MYSQL_POOL_MAX_SIZE", "5"))
+# Idle connections older than this are closed instead of reused
+POOL_MAX_IDLE_SECONDS = float(os.getenv("MYSQL_POOL_MAX_IDLE_SECONDS", "300"))
+# Connections idle for longer than this are pinged before reuse
+POOL_PING_AFTER_SECONDS = float(os.getenv("MYSQL_POOL_PING_AFTER_SECONDS", "30"))
+# Distinct credential sets kept pooled at once (least recently used is dropped)
+POOL_MAX_CREDENTIAL_SETS = int(os.getenv("MYSQL_POOL_MAX_CREDENTIAL_SETS", "16"))
+
+
+def config_key(config: dict) -> tuple:
+    """Hashable key for a db config as returned by get_db_config."""
+    return tuple(sorted((k, str(v)) for k, v in config.items()))
+
+
+def abandon(conn):
+    """
+    Give up on a connection in the middle of a result set without reading the rest of it,
+    which on a large result could take longer than the query itself. The pool discards it on release.
+    """
+    conn.shutdown()
+    # Nothing is left to read once the socket is gone; lets cursor.close() and release() go ahead
+    conn.unread_result = False
+
+
+class ConnectionPool:
+    """Idle MySQL connections for one credential set."""
+
+    def __init__(self, config: dict, max_size: int = POOL_MAX_SIZE, max_idle_seconds: float = POOL_MAX_IDLE_SECONDS):
+        self.config = config
+        self.max_size = max_size
+        self.max_idle_seconds = max_idle_seconds
+        self._idle = []  # (connection, released_at), most recently released last
+        self._lock = threading.Lock()
+
+    def _close(self, conn):
+        try:
+            conn.close()
+        except Error:
+            pass
+
+    def acquire(self):
+        """Return a live pooled connection, or open a new one."""
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                conn, released_at = self._idle.pop()
+            idle_for = time.monotonic() - released_at
+            if idle_for > self.max_idle_seconds:
+                self._close(conn)
+                continue
+            if idle_for > POOL_PING_AFTER_SECONDS and not conn.is_connected():
+                self._close(conn)
+                continue
+            return conn
+
+        conn = connect(**self.config)
+        logger.info(f"Opened MySQL connection to {self.config.get('host')}:{self.config.get('port')} (server version {conn.get_server_info()})")
+        return conn
+
+    def release(self, conn, discard: bool = False):
+        """Return a connection to the pool, closing it if the pool is full or it is unusable."""
+        if not discard:
+            try:
+                if conn.unread_result:
+                    conn.consume_results()
+                # Raises for abandon()ed or otherwise dead connections, which are then discarded.
+                # Roll back open transactions and clear locks, user/session variables and temp tables,
+                # so none of it reaches the next caller (COM_RESET_CONNECTION, or a re-auth on old servers)
+                conn.reset_session()
+                # A `USE other_db` must not leak into the next caller
+                if conn.database != self.config.get("database"):
+                    conn.database = self.config.get("database")
+            except Error:
+                discard = True
+
+        if not discard:
+            with self._lock:
+                self.evict_idle()
+                if len(self._idle) < self.max_size:
+                    self._idle.append((conn, time.monotonic()))
+                    return
+        self._close(conn)
+
+    def evict_idle(self):
+        """Close idle connections past max_idle_seconds. Caller holds the lock."""
+        now = time.monotonic()
+        keep = []
+        for conn, released_at in self._idle:
+            if now - released_at > self.max_idle_seconds:
+                self._close(conn)
+            else:
+                keep.append((conn, released_at))
+        self._idle = keep
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            self._close(conn)
+
+
+class PoolManager:
+    """Connection pools keyed on the credential set, bounded with LRU eviction."""
+
+    def __init__(self, max_credential_sets: int = POOL_MAX_CREDENTIAL_SETS):
+        self.max_credential_sets = max_credential_sets
+        self._pools = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_pool(self, config: dict) -> ConnectionPool:
+        key = config_key(config)
+        evicted = []
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = ConnectionPool(config)
+                self._pools[key] = pool
+                while len(self._pools) > self.max_credential_sets:
+                    _, old_pool = self._pools.popitem(last=False)
+                    evicted.append(old_pool)
+            else:
+                self._pools.move_to_end(key)
+        for old_pool in evicted:
+            old_pool.close_all()
+        return pool
+
+    @contextmanager
+    def connection(self, config: dict, discard_if: Optional[Callable[[], bool]] = None):
+        """Borrow a connection for the duration of the block. discard_if() is asked on exit whether to close it rather than pool it."""
+        pool = self.get_pool(config)
+        conn = pool.acquire()
+        discard = False
+        try:
+            yield conn
+        except Error:
+            # Broken connections are not returned to the pool
+            discard = not conn.is_connected()
+            raise
+        except BaseException:
+            discard = True
+            raise
+        finally:
+            if discard_if is not None and discard_if():
+                discard = True
+            pool.release(conn, discard=discard)
+
+    def close_all(self):
+        with self._lock:
+            pools, self._pools = list(self._pools.values()), OrderedDict()
+        for pool in pools:
+            pool.close_all()
+
+
+pools = PoolManager()
@@ -1,9 +1,15 @@
+import os
+import csv
+import json
 import asyncio
 import logging
-from mysql.connector import connect, Error
+from mysql.connector import Error
 from mcp.server import Server
 from mcp.types import Resource, Tool, TextContent
 from pydantic import AnyUrl
+from .pool import pools, abandon
+from .cache import query_cache, schema_cache, is_cacheable, is_read_only, is_ddl, QUERY_CACHE_ENABLED
+from .executor import run_blocking, run_query, QueryState, QueryTimeoutError, shutdown as shutdown_executor
 
 # Configure logging
 logging.basicConfig(
@@ -43,38 +49,98 @@ def get_db_config(credentials: dict):
 
     return config
 
+# Result budget for execute_sql output
+MAX_RESULT_ROWS = int(os.getenv("MYSQL_MAX_RESULT_ROWS", "1000"))
+MAX_RESULT_BYTES = int(os.getenv("MYSQL_MAX_RESULT_BYTES", str(256 * 1024)))
+FETCH_BATCH_SIZE = int(os.getenv("MYSQL_FETCH_BATCH_SIZE", "500"))
+
+class _LineSink:
+    """File-like target for csv.writer that keeps rendered lines and their UTF-8 size."""
+    def __init__(self):
+        self.lines = []
+        self.size = 0
+
+    def write(self, line: str):
+        self.lines.append(line)
+        self.size += len(line.encode("utf-8"))
+
+    def drop_last(self):
+        line = self.lines.pop()
+        self.size -= len(line.encode("utf-8"))
+
+def serialize_result_set(conn, cursor, max_rows: int = MAX_RESULT_ROWS, max_bytes: int = MAX_RESULT_BYTES) -> str:
+    """
+    Render a result set as CSV, fetching in batches; NULL is written as an empty field.
+    Output stops at max_rows rows or max_bytes bytes. The rest of the result is not read:
+    the connection is abandoned instead, so a huge SELECT returns its first rows rather than timing out.
+    """
+    sink = _LineSink()
+    writer = csv.writer(sink, lineterminator="\n")
+    writer.writerow([desc[0] for desc in cursor.description])
+
+    written = 0
+    truncated = False
+    while not truncated:
+        rows = cursor.fetchmany(FETCH_BATCH_SIZE)
+        if not rows:
+            break
+        for row in rows:
+            if written >= max_rows:
+                truncated = True
+                break
+            writer.writerow(row)
+            if sink.size > max_bytes:
+                sink.drop_last()
+                truncated = True
+                break
+            written += 1
+
+    text = "".join(sink.lines).rstrip("\n")
+    if truncated:
+        if conn.unread_result:
+            abandon(conn)
+        text += f"\n-- truncated: showing the first {written} rows; the query returned more (limits: {max_rows} rows, {max_bytes} bytes)"
+    return text
+
 # Initialize server
 app = Server("mysql_mcp_server")
 
+def _list_tables(config: dict) -> list:
+    with pools.connection(config) as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("SHOW TABLES")
+            return cursor.fetchall()
+
 @app.list_resources()
 async def list_resources(__credentials__: dict) -> list[Resource]:
     """List MySQL tables as resources."""
     config = get_db_config(__credentials__)
     try:
-        logger.info(f"Connecting to MySQL with charset: {config.get('charset')}, collation: {config.get('collation')}")
-        with connect(**config) as conn:
-            logger.info(f"Successfully connected to MySQL server version: {conn.get_server_info()}")
-            with conn.cursor() as cursor:
-                cursor.execute("SHOW TABLES")
-                tables = cursor.fetchall()
-                logger.info(f"Found tables: {tables}")
-
-                resources = []
-                for table in tables:
-                    resources.append(
-                        Resource(
-                            uri=f"mysql://{table[0]}/data",
-                            name=f"Table: {table[0]}",
-                            mimeType="text/plain",
-                            description=f"Data in table: {table[0]}"
-                        )
-                    )
-                return resources
+        tables = await run_blocking(_list_tables, config)
+        logger.info(f"Found tables: {tables}")
+
+        resources = []
+        for table in tables:
+            resources.append(
+                Resource(
+                    uri=f"mysql://{table[0]}/data",
+                    name=f"Table: {table[0]}",
+                    mimeType="text/plain",
+                    description=f"Data in table: {table[0]}"
+                )
+            )
+        return resources
     except Error as e:
         logger.error(f"Failed to list resources: {str(e)}")
         logger.error(f"Error code: {e.errno}, SQL state: {e.sqlstate}")
         return []
 
+def _read_table(config: dict, table: str) -> str:
+    with pools.connection(config) as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(f"SELECT * FROM {table} LIMIT 100")
+            return serialize_result_set(conn, cursor)
+
 @app.read_resource()
 async def read_resource(uri: AnyUrl, __credentials__: dict) -> str:
     """Read table contents."""
@@ -89,15 +155,7 @@ async def read_resource(uri: AnyUrl, __credentials__: dict) -> str:
     table = parts[0]
 
     try:
-        logger.info(f"Connecting to MySQL with charset: {config.get('charset')}, collation: {config.get('collation')}")
-        with connect(**config) as conn:
-            logger.info(f"Successfully connected to MySQL server version: {conn.get_server_info()}")
-            with conn.cursor() as cursor:
-                cursor.execute(f"SELECT * FROM {table} LIMIT 100")
-                columns = [desc[0] for desc in cursor.description]
-                rows = cursor.fetchall()
-                result = [",".join(map(str, row)) for row in rows]
-                return "\n".join([",".join(columns)] + result)
+        return await run_blocking(_read_table, config, table)
 
     except Error as e:
         logger.error(f"Database error reading resource {uri}: {str(e)}")
@@ -122,9 +180,93 @@ async def list_tools() -> list[Tool]:
                 },
                 "required": ["query"]
             }
+        ),
+        Tool(
+            name="describe_schema",
+            description="Describe every table in the database in one call: one line per table listing columns with type, PK, nullability (?), auto increment (AI) and foreign key targets (->table.column). Use this instead of SHOW TABLES plus DESCRIBE per table.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "tables": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Optional: only describe these tables"
+                    }
+                }
+            }
+        ),
+        Tool(
+            name="get_query_cache_stats",
+            description="Return hit/miss counters and size of the read-only query result cache",
+            inputSchema={"type": "object", "properties": {}}
         )
     ]
 
+def _execute_sql(query_state: QueryState, config: dict, query: str) -> str:
+    """Run one statement on a pooled connection. Runs on a worker thread."""
+    # Read before the query runs so a write that lands meanwhile retires this result
+    generation = query_cache.generation(config) if QUERY_CACHE_ENABLED and is_cacheable(query) else None
+    with query_state.connection(config) as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(query)
+
+            if query.strip().upper().startswith("SHOW TABLES"):
+                tables = cursor.fetchall()
+                result = ["Tables_in_" + config["database"]]
+                result.extend([table[0] for table in tables])
+                result_text = "\n".join(result)
+                if QUERY_CACHE_ENABLED and is_cacheable(query):
+                    query_cache.put(config, query, result_text, generation)
+                return result_text
+
+            elif cursor.description is not None:
+                try:
+                    result_text = serialize_result_set(conn, cursor)
+                    if QUERY_CACHE_ENABLED and is_cacheable(query):
+                        query_cache.put(config, query, result_text, generation)
+                    return result_text
+                except Error as e:
+                    logger.warning(f"Error fetching results: {str(e)}")
+                    return f"Query executed but error fetching results: {str(e)}"
+
+            else:
+                conn.commit()
+                return f"Query executed successfully. Rows affected: {cursor.rowcount}"
+
+SCHEMA_QUERY = """
+    SELECT c.TABLE_NAME, c.COLUMN_NAME, c.COLUMN_TYPE, c.IS_NULLABLE, c.COLUMN_KEY, c.EXTRA,
+           k.REFERENCED_TABLE_NAME, k.REFERENCED_COLUMN_NAME
+    FROM information_schema.COLUMNS c
+    LEFT JOIN information_schema.KEY_COLUMN_USAGE k
+        ON k.TABLE_SCHEMA = c.TABLE_SCHEMA AND k.TABLE_NAME = c.TABLE_NAME
+        AND k.COLUMN_NAME = c.COLUMN_NAME AND k.REFERENCED_TABLE_NAME IS NOT NULL
+    WHERE c.TABLE_SCHEMA = %s
+    ORDER BY c.TABLE_NAME, c.ORDINAL_POSITION
+"""
+
+def format_schema(rows: list) -> str:
+    """Render information_schema rows as one compact line per table."""
+    tables = {}
+    for table, column, column_type, nullable, key, extra, ref_table, ref_column in rows:
+        parts = [column, column_type]
+        if key == "PRI":
+            parts.append("PK")
+        if nullable == "YES":
+            parts.append("?")
+        if extra and "auto_increment" in extra:
+            parts.append("AI")
+        if ref_table:
+            parts.append(f"->{ref_table}.{ref_column}")
+        tables.setdefault(table, []).append(" ".join(parts))
+    return "\n".join(f"{table}({', '.join(columns)})" for table, columns in tables.items())
+
+def _describe_schema(query_state: QueryState, config: dict) -> str:
+    """Fetch and render the whole schema with one information_schema query. Runs on a worker thread."""
+    with query_state.connection(config) as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(SCHEMA_QUERY, (config["database"],))
+            return format_schema(cursor.fetchall())
+
 @app.call_tool()
 async def call_tool(name: str, arguments: dict) -> list[TextContent]:
     """Execute SQL commands."""
@@ -135,6 +277,26 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
     config = get_db_config(__credentials__)
     logger.info(f"Calling tool: {name} with arguments: {arguments}")
 
+    if name == "get_query_cache_stats":
+        return [TextContent(type="text", text=json.dumps({"query_cache": query_cache.stats(), "schema_cache": schema_cache.stats()}))]
+
+    if name == "describe_schema":
+        schema_text = schema_cache.get(config, "describe_schema")
+        if schema_text is None:
+            generation = schema_cache.generation(config)
+            try:
+                schema_text = await run_query(config, _describe_schema, config)
+            except (QueryTimeoutError, Error) as e:
+                logger.error(f"Error describing schema: {e}")
+                return [TextContent(type="text", text=f"Error describing schema: {str(e)}")]
+            schema_cache.put(config, "describe_schema", schema_text, generation)
+
+        tables = arguments.get("tables")
+        if tables:
+            wanted = {table.lower() for table in tables}
+            schema_text = "\n".join(line for line in schema_text.split("\n") if line.split("(", 1)[0].lower() in wanted)
+        return [TextContent(type="text", text=schema_text or "No tables found.")]
+
     if name != "execute_sql":
         raise ValueError(f"Unknown tool: {name}")
 
@@ -142,38 +304,32 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
     if not query:
         raise ValueError("Query is required")
 
+    if QUERY_CACHE_ENABLED and is_cacheable(query):
+        cached = query_cache.get(config, query)
+        if cached is not None:
+            logger.info("Serving query result from cache")
+            return [TextContent(type="text", text=cached)]
+
     try:
-        logger.info(f"Connecting to MySQL with charset: {config.get('charset')}, collation: {config.get('collation')}")
-        with connect(**config) as conn:
-            logger.info(f"Successfully connected to MySQL server version: {conn.get_server_info()}")
-            with conn.cursor() as cursor:
-                cursor.execute(query)
-
-                if query.strip().upper().startswith("SHOW TABLES"):
-                    tables = cursor.fetchall()
-                    result = ["Tables_in_" + config["database"]]
-                    result.extend([table[0] for table in tables])
-                    return [TextContent(type="text", text="\n".join(result))]
-
-                elif cursor.description is not None:
-                    columns = [desc[0] for desc in cursor.description]
-                    try:
-                        rows = cursor.fetchall()
-                        result = [",".join(map(str, row)) for row in rows]
-                        return [TextContent(type="text", text="\n".join([",".join(columns)] + result))]
-                    except Error as e:
-                        logger.warning(f"Error fetching results: {str(e)}")
-                        return [TextContent(type="text", text=f"Query executed but error fetching results: {str(e)}")]
-
-                else:
-                    conn.commit()
-                    return [TextContent(type="text", text=f"Query executed successfully. Rows affected: {cursor.rowcount}")]
+        result_text = await run_query(config, _execute_sql, config, query)
+        return [TextContent(type="text", text=result_text)]
+
+    except QueryTimeoutError as e:
+        logger.error(f"Timed out executing SQL '{query}': {e}")
+        return [TextContent(type="text", text=f"Error executing query: {str(e)}")]
 
     except Error as e:
         logger.error(f"Error executing SQL '{query}': {e}")
         logger.error(f"Error code: {e.errno}, SQL state: {e.sqlstate}")
         return [TextContent(type="text", text=f"Error executing query: {str(e)}")]
 
+    finally:
+        # Writes and schema changes make cached reads for these credentials stale
+        if not is_read_only(query):
+            query_cache.invalidate(config)
+        if is_ddl(query):
+            schema_cache.invalidate(config)
+
 async def main():
     """Main entry point to run the MCP server."""
     from mcp.server.stdio import stdio_server
@@ -190,6 +346,9 @@ async def main():
         except Exception as e:
             logger.error(f"Server error: {str(e)}", exc_info=True)
             raise
+        finally:
+            shutdown_executor()
+            pools.close_all()
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,76 @@
+"""
+Load time and memory of the CSV loading options in src/pandas_mcp_server/loading.py.
+
+Generates a synthetic CSV (integer, float and low-cardinality string columns) and compares:
+  baseline        - pd.read_csv with the C parser
+  optimized-c     - the C parser followed by optimize_dtypes()
+  optimized-arrow - the pyarrow engine followed by optimize_dtypes()
+  projection      - loading.read_csv with a single-column projection
+
+Run from the pandas-mcp-server directory:
+
+    uv run python benchmarks/csv_loading.py --rows 200000
+"""
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+from pandas_mcp_server import loading  # noqa: E402
+
+
+def make_csv(path: Path, rows: int, int_columns: int, float_columns: int, string_columns: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    data = {}
+    for i in range(int_columns):
+        data[f"int_{i}"] = rng.integers(0, 1000, rows)
+    for i in range(float_columns):
+        data[f"float_{i}"] = rng.random(rows) * 1000
+    labels = np.array([f"label_{i}" for i in range(20)])
+    for i in range(string_columns):
+        data[f"str_{i}"] = labels[rng.integers(0, len(labels), rows)]
+    pd.DataFrame(data).to_csv(path, index=False)
+
+
+def measure(load, repeat: int):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        df = load()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, df.memory_usage(deep=True).sum() / 2 ** 20
+
+
+def main(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.csv"
+        make_csv(path, args.rows, args.int_columns, args.float_columns, args.string_columns)
+        size = path.stat().st_size / 2 ** 20
+
+        cases = {
+            "baseline": lambda: pd.read_csv(path),
+            "optimized-c": lambda: loading.optimize_dtypes(pd.read_csv(path)),
+            "optimized-arrow": lambda: loading.optimize_dtypes(pd.read_csv(path, engine="pyarrow")),
+            "projection": lambda: loading.read_csv(path, columns=["int_0"]),
+        }
+        print(f"{args.rows} rows, {args.int_columns + args.float_columns + args.string_columns} columns, {size:.1f} MiB CSV, best of {args.repeat}")
+        print(f"{'case':<18}{'seconds':>10}{'MiB':>10}")
+        for name, load in cases.items():
+            seconds, mib = measure(load, args.repeat)
+            print(f"{name:<18}{seconds:>10.2f}{mib:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--int-columns", type=int, default=15)
+    parser.add_argument("--float-columns", type=int, default=15)
+    parser.add_argument("--string-columns", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case; the fastest is reported")
+    main(parser.parse_args())
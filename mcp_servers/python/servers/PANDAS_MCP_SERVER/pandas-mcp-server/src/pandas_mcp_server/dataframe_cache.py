@@ -0,0 +1,157 @@
+import io
+import os
+import time
+import logging
+import threading
+import urllib.request
+import urllib.error
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional
+import pandas as pd
+from .spill import frame_spill
+from .loading import read_csv
+
+logger = logging.getLogger(__name__)
+
+# Total memory the cached DataFrames may use before least recently used ones are dropped
+CACHE_MAX_BYTES = int(os.getenv("PANDAS_CACHE_MAX_BYTES", str(1024 * 1024 * 1024)))
+# Cached frames younger than this are used without asking the origin whether they changed
+REVALIDATE_AFTER_SECONDS = float(os.getenv("PANDAS_CACHE_REVALIDATE_SECONDS", "30"))
+HTTP_TIMEOUT_SECONDS = float(os.getenv("PANDAS_HTTP_TIMEOUT_SECONDS", "60"))
+
+
+@dataclass
+class CachedFrame:
+    df: pd.DataFrame
+    size: int
+    validated_at: float
+    # etag / last_modified for HTTP, file_stamp for local files
+    validators: dict = field(default_factory=dict)
+
+
+def _is_http(url: str) -> bool:
+    return url.startswith("http://") or url.startswith("https://")
+
+
+def _local_path(url: str) -> Optional[str]:
+    path = url[len("file://"):] if url.startswith("file://") else url
+    return path if os.path.isfile(path) else None
+
+
+def _cache_key(url: str, columns: Optional[list]) -> str:
+    return url if columns is None else f"{url}#columns={','.join(sorted(columns))}"
+
+
+def _frame_size(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(deep=True).sum())
+
+
+class DataFrameCache:
+    """
+    In-process LRU cache of parsed CSVs keyed by URL, revalidated with ETag/Last-Modified or file mtime.
+    Misses fall back to the on-disk spill before parsing the CSV again.
+    """
+
+    def __init__(self, max_bytes: int = CACHE_MAX_BYTES, revalidate_after: float = REVALIDATE_AFTER_SECONDS):
+        self.max_bytes = max_bytes
+        self.revalidate_after = revalidate_after
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def _store(self, url: str, entry: CachedFrame):
+        with self._lock:
+            old = self._entries.pop(url, None)
+            if old is not None:
+                self._bytes -= old.size
+            if entry.size > self.max_bytes:
+                logger.info(f"DataFrame for {url} ({entry.size} bytes) exceeds the cache budget, not caching")
+                return
+            self._entries[url] = entry
+            self._bytes += entry.size
+            while self._bytes > self.max_bytes:
+                evicted_url, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+                logger.info(f"Evicted cached DataFrame for {evicted_url}")
+
+    def _fetch_http(self, url: str, validators: Optional[dict], columns: Optional[list]):
+        """Download and parse url. Returns (df, validators), or None when the origin answers 304."""
+        request = urllib.request.Request(url)
+        if validators:
+            if validators.get("etag"):
+                request.add_header("If-None-Match", validators["etag"])
+            if validators.get("last_modified"):
+                request.add_header("If-Modified-Since", validators["last_modified"])
+        try:
+            with urllib.request.urlopen(request, timeout=HTTP_TIMEOUT_SECONDS) as response:
+                df = read_csv(io.BytesIO(response.read()), columns)
+                return df, {"etag": response.headers.get("ETag"), "last_modified": response.headers.get("Last-Modified")}
+        except urllib.error.HTTPError as e:
+            if e.code == 304 and validators:
+                return None
+            raise
+
+    def _fetch(self, url: str, validators: Optional[dict], columns: Optional[list]):
+        """Returns (df, validators) with a freshly parsed frame, or None when the known copy is still current."""
+        if _is_http(url):
+            return self._fetch_http(url, validators, columns)
+
+        path = _local_path(url)
+        if path is not None:
+            stat = os.stat(path)
+            stamp = [stat.st_mtime_ns, stat.st_size]
+            if validators and validators.get("file_stamp") == stamp:
+                return None
+            return read_csv(path, columns), {"file_stamp": stamp}
+
+        # Other schemes pandas understands (s3://, gs://, ...) have no cheap validator; refetch once the window passes
+        saved_at = (validators or {}).get("saved_at")
+        if saved_at and time.time() - saved_at < self.revalidate_after:
+            return None
+        return read_csv(url, columns), {}
+
+    def __contains__(self, url: str) -> bool:
+        with self._lock:
+            return url in self._entries
+
+    def get(self, url: str, columns: Optional[list] = None) -> pd.DataFrame:
+        """
+        Return the DataFrame for url, reusing the memory or disk copy when the origin hasn't changed.
+        With `columns`, only those columns are parsed and the projection is cached on its own,
+        unless the full frame is already in memory.
+        """
+        if columns is not None and url in self:
+            df = self.get(url)
+            return df[[column for column in columns if column in df.columns]]
+
+        key = _cache_key(url, columns)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        if entry is not None and time.monotonic() - entry.validated_at < self.revalidate_after:
+            return entry.df
+
+        validators = entry.validators if entry is not None else frame_spill.read_meta(key)
+        fetched = self._fetch(url, validators, columns)
+
+        df = None
+        if fetched is None:
+            df = entry.df if entry is not None else frame_spill.load(key)
+            if df is None:
+                # The spilled copy is unreadable; fetch unconditionally
+                fetched = self._fetch(url, None, columns)
+            else:
+                logger.info(f"Cached DataFrame for {key} is still current")
+
+        if fetched is not None:
+            df, validators = fetched
+            frame_spill.save(key, df, validators)
+
+        self._store(key, CachedFrame(df=df, size=_frame_size(df), validated_at=time.monotonic(), validators=validators or {}))
+        return df
+
+
+dataframe_cache = DataFrameCache()
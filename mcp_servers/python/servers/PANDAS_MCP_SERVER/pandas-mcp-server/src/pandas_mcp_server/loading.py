@@ -0,0 +1,46 @@
+import os
+from typing import Optional
+import pandas as pd
+
+# "c" (default) or "pyarrow" (multi-threaded, used for full-frame loads)
+CSV_ENGINE = os.getenv("PANDAS_CSV_ENGINE", "c")
+# Opt-in: compact dtypes change what run_pandas_code sees (small ints overflow silently,
+# category columns reject values outside their categories)
+OPTIMIZE_DTYPES = os.getenv("PANDAS_OPTIMIZE_DTYPES", "false").lower() == "true"
+# Float downcasting loses precision, so it is opt-in
+DOWNCAST_FLOATS = os.getenv("PANDAS_DOWNCAST_FLOATS", "false").lower() == "true"
+# String columns whose distinct/total ratio is at most this become category
+CATEGORY_MAX_RATIO = float(os.getenv("PANDAS_CATEGORY_MAX_RATIO", "0.5"))
+
+
+def optimize_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Downcast integers (and optionally floats) and turn low-cardinality strings into categories, in place."""
+    rows = len(df)
+    for column in df.columns:
+        series = df[column]
+        if pd.api.types.is_bool_dtype(series):
+            continue
+        if pd.api.types.is_integer_dtype(series):
+            df[column] = pd.to_numeric(series, downcast="integer")
+        elif pd.api.types.is_float_dtype(series) and DOWNCAST_FLOATS:
+            df[column] = pd.to_numeric(series, downcast="float")
+        elif (pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)) and rows and series.nunique(dropna=True) / rows <= CATEGORY_MAX_RATIO:
+            df[column] = series.astype("category")
+    return df
+
+
+def read_csv(source, columns: Optional[list] = None) -> pd.DataFrame:
+    """
+    Parse a CSV, keeping only `columns` when given. Requested columns missing from the file are
+    silently skipped so callers can report them the same way as for a full frame.
+    """
+    kwargs = {}
+    if columns is not None:
+        wanted = set(columns)
+        # The pyarrow engine rejects callable usecols, so projected loads use the C parser
+        kwargs["usecols"] = lambda column: column in wanted
+    elif CSV_ENGINE == "pyarrow":
+        kwargs["engine"] = "pyarrow"
+
+    df = pd.read_csv(source, **kwargs)
+    return optimize_dtypes(df) if OPTIMIZE_DTYPES else df
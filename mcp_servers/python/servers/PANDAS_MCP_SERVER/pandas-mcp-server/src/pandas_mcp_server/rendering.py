@@ -0,0 +1,150 @@
+import os
+import json
+from io import StringIO
+import pandas as pd
+
+# Budgets applied to every rendered tool result
+OUTPUT_MAX_ROWS = int(os.getenv("PANDAS_OUTPUT_MAX_ROWS", "50"))
+OUTPUT_MAX_COLUMNS = int(os.getenv("PANDAS_OUTPUT_MAX_COLUMNS", "20"))
+OUTPUT_MAX_CHARS = int(os.getenv("PANDAS_OUTPUT_MAX_CHARS", "20000"))
+# Values listed by get_value_counts before the rest are folded into an "(other)" row
+VALUE_COUNTS_TOP_K = int(os.getenv("PANDAS_VALUE_COUNTS_TOP_K", "20"))
+
+FORMATS = ("text", "markdown", "json")
+
+
+def truncate_text(text: str, max_chars: int = OUTPUT_MAX_CHARS) -> str:
+    """Cut text to max_chars, at a line boundary when there is one, and say how much was dropped."""
+    if len(text) <= max_chars:
+        return text
+    cut = text.rfind("\n", 0, max_chars)
+    if cut <= 0:
+        cut = max_chars
+    return f"{text[:cut]}\n... [truncated {len(text) - cut} characters]"
+
+
+def _cell(value) -> str:
+    return str(value).replace("|", "\\|").replace("\n", " ")
+
+
+def _markdown(df: pd.DataFrame) -> str:
+    header = [_cell(df.index.name or "")] + [_cell(column) for column in df.columns]
+    lines = ["| " + " | ".join(header) + " |", "|" + "---|" * len(header)]
+    for index, row in zip(df.index, df.itertuples(index=False)):
+        lines.append("| " + " | ".join([_cell(index)] + [_cell(value) for value in row]) + " |")
+    return "\n".join(lines)
+
+
+def _json(payload: dict) -> str:
+    return json.dumps(payload, default=str, separators=(",", ":"))
+
+
+def _table_payload(df: pd.DataFrame) -> dict:
+    # to_json handles NaN/NaT/numpy scalars; loads turns it back into plain lists
+    split = json.loads(df.to_json(orient="split", date_format="iso", default_handler=str))
+    return {"columns": split["columns"], "index": split["index"], "data": split["data"]}
+
+
+def _shown_note(total_rows: int, shown_rows: int, total_columns: int, shown_columns: int) -> str:
+    parts = []
+    if shown_rows < total_rows:
+        parts.append(f"{shown_rows} of {total_rows} rows")
+    if shown_columns < total_columns:
+        parts.append(f"{shown_columns} of {total_columns} columns")
+    return f"... (showing {', '.join(parts)})" if parts else ""
+
+
+def render_table(df: pd.DataFrame, fmt: str = "text", max_rows: int = OUTPUT_MAX_ROWS, max_columns: int = OUTPUT_MAX_COLUMNS, max_chars: int = OUTPUT_MAX_CHARS) -> str:
+    """Render the first max_rows x max_columns of df in the requested format, within max_chars."""
+    total_rows, total_columns = df.shape
+    shown = df.iloc[:max_rows, :max_columns]
+
+    if fmt == "json":
+        # Drop rows until the document fits rather than cutting it into invalid JSON
+        while True:
+            payload = _table_payload(shown)
+            payload.update({"total_rows": total_rows, "total_columns": total_columns})
+            text = _json(payload)
+            if len(text) <= max_chars or len(shown) <= 1:
+                return text
+            shown = shown.iloc[:len(shown) // 2]
+
+    text = _markdown(shown) if fmt == "markdown" else shown.to_string()
+    note = _shown_note(total_rows, len(shown), total_columns, shown.shape[1])
+    return truncate_text(f"{text}\n{note}" if note else text, max_chars)
+
+
+def render_series(series: pd.Series, fmt: str = "text", max_rows: int = OUTPUT_MAX_ROWS, max_chars: int = OUTPUT_MAX_CHARS) -> str:
+    """Render a Series (describe() output, value counts, ...) with the same budgets as render_table."""
+    if fmt == "json":
+        shown = series.iloc[:max_rows]
+        payload = {"name": series.name, "index_name": series.index.name, "values": json.loads(shown.to_json(orient="index", default_handler=str))}
+        if len(shown) < len(series):
+            payload["total"] = len(series)
+        return truncate_text(_json(payload), max_chars)
+    if fmt == "markdown":
+        return render_table(series.to_frame(series.name if series.name is not None else "value"), fmt, max_rows, max_chars=max_chars)
+
+    shown = series.iloc[:max_rows]
+    text = shown.to_string()
+    if len(shown) < len(series):
+        text += f"\n... (showing {len(shown)} of {len(series)} rows)"
+    return truncate_text(text, max_chars)
+
+
+def top_k_counts(counts: pd.Series, top_k: int = VALUE_COUNTS_TOP_K) -> pd.Series:
+    """Keep the top_k largest counts and fold the remainder into a single "(other)" row."""
+    if len(counts) <= top_k:
+        return counts
+    rest = counts.iloc[top_k:]
+    other_label = f"(other: {len(rest)} values)"
+    top = pd.concat([counts.iloc[:top_k], pd.Series([int(rest.sum())], index=[other_label])])
+    top.index.name = counts.index.name
+    top.name = counts.name
+    return top
+
+
+def render_summary(df: pd.DataFrame, fmt: str = "text", max_columns: int = OUTPUT_MAX_COLUMNS, max_chars: int = OUTPUT_MAX_CHARS) -> str:
+    """Shape, column types and the first 5 rows, listing at most max_columns columns."""
+    columns = df.columns.tolist()
+    listed = columns[:max_columns]
+    more = f" ... and {len(columns) - len(listed)} more" if len(columns) > len(listed) else ""
+
+    if fmt == "json":
+        payload = {
+            "shape": list(df.shape),
+            "dtypes": {str(column): str(df[column].dtype) for column in listed},
+            "non_null": {str(column): int(df[column].count()) for column in listed},
+            "memory_bytes": int(df.memory_usage(deep=True).sum()),
+            "head": _table_payload(df.head().iloc[:, :max_columns]),
+        }
+        return truncate_text(_json(payload), max_chars)
+
+    if fmt == "markdown":
+        dtypes = pd.DataFrame({"dtype": df.dtypes.astype(str), "non_null": df.count()}).iloc[:max_columns]
+        dtypes.index.name = "column"
+        text = (
+            f"**Shape:** {df.shape[0]} rows x {df.shape[1]} columns\n\n"
+            f"**Columns:**\n\n{_markdown(dtypes)}{more}\n\n"
+            f"**Head:**\n\n{render_table(df.head(), 'markdown', max_columns=max_columns)}"
+        )
+        return truncate_text(text, max_chars)
+
+    buffer = StringIO()
+    buffer.write(f"Shape: {df.shape}\n\n")
+    buffer.write("Columns:\n")
+    buffer.write(f"{listed}{more}\n\n")
+    buffer.write("Data Types:\n")
+    df.info(buf=buffer, max_cols=max_columns)
+    buffer.write("\nHead:\n")
+    buffer.write(render_table(df.head(), max_columns=max_columns))
+    return truncate_text(buffer.getvalue(), max_chars)
+
+
+def render_value(value) -> str:
+    """str() for arbitrary run_pandas_code results, with frames and series held to the row/column budgets."""
+    if isinstance(value, pd.DataFrame):
+        return render_table(value)
+    if isinstance(value, pd.Series):
+        return render_series(value)
+    return truncate_text(str(value))
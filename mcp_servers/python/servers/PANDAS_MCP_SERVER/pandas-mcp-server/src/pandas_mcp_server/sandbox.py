@@ -0,0 +1,262 @@
+import os
+import signal
+import asyncio
+import logging
+import multiprocessing
+from io import StringIO
+from contextlib import redirect_stdout
+from typing import Optional
+import numpy as np
+import pandas as pd
+from .rendering import render_value, truncate_text
+
+try:
+    import resource
+except ImportError:  # not available on Windows; limits are skipped
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+SANDBOX_WORKERS = int(os.getenv("PANDAS_SANDBOX_WORKERS", "2"))
+# Wall-clock limit per run_pandas_code call; the worker is killed when it is exceeded
+SANDBOX_TIMEOUT_SECONDS = float(os.getenv("PANDAS_SANDBOX_TIMEOUT_SECONDS", "30"))
+# CPU seconds a single call may use (enforced with RLIMIT_CPU)
+SANDBOX_CPU_SECONDS = int(os.getenv("PANDAS_SANDBOX_CPU_SECONDS", "30"))
+# Address space limit per worker in MB (RLIMIT_AS), 0 disables it. Must leave room for the memory-mapped dataset.
+SANDBOX_MEMORY_MB = int(os.getenv("PANDAS_SANDBOX_MEMORY_MB", "4096"))
+SANDBOX_STARTUP_TIMEOUT_SECONDS = float(os.getenv("PANDAS_SANDBOX_STARTUP_TIMEOUT_SECONDS", "60"))
+# Workers are replaced after this many calls so leaked state doesn't accumulate
+SANDBOX_MAX_JOBS_PER_WORKER = int(os.getenv("PANDAS_SANDBOX_MAX_JOBS_PER_WORKER", "50"))
+
+SAFE_BUILTINS = {
+    'print': print, 'len': len, 'str': str, 'int': int, 'float': float,
+    'list': list, 'dict': dict, 'set': set, 'tuple': tuple, 'range': range,
+    'True': True, 'False': False, 'None': None
+}
+
+
+class SandboxError(Exception):
+    """The worker running user code was killed or died."""
+
+
+def execute_code(code: str, df: pd.DataFrame) -> str:
+    """Run user code against df and render its printed output and `result` variable."""
+    safe_globals = {'pd': pd, 'np': np, '__builtins__': SAFE_BUILTINS}
+    safe_locals = {'df': df}
+    output_buffer = StringIO()
+
+    try:
+        with redirect_stdout(output_buffer):
+            exec(code, safe_globals, safe_locals)
+
+        printed_output = output_buffer.getvalue()
+        result_val = safe_locals.get('result')
+
+        final_output = ""
+        if printed_output:
+            final_output += f"Output:\n{truncate_text(printed_output)}"
+        if result_val is not None:
+            final_output += f"\nResult:\n{render_value(result_val)}"
+
+        return final_output if final_output else "Code executed successfully with no output."
+    except MemoryError:
+        return f"Error executing code: memory limit of {SANDBOX_MEMORY_MB} MB exceeded"
+    except Exception as e:
+        return f"Error executing code: {e}"
+
+
+def _set_cpu_limit(seconds: int):
+    """Allow `seconds` more CPU time from now; going over raises SIGXCPU and ends the worker."""
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    used = int(usage.ru_utime + usage.ru_stime) + 1
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = used + seconds
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _worker_main(conn, memory_mb: int):
+    # Ctrl+C goes to the whole process group; the parent decides when workers stop
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if resource is not None and memory_mb > 0:
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    if int(pd.__version__.split(".")[0]) < 3:
+        # Always on from pandas 3; writes to the cached frame's columns must copy them instead
+        pd.set_option("mode.copy_on_write", True)
+    conn.send("ready")
+
+    # Frames converted from the memory-mapped spill, by (path, inode, size). Numeric columns stay
+    # views of the mapped pages, which are shared with every process mapping the file.
+    frames = {}
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            return
+        if job is None:
+            return
+        code, source = job
+        if resource is not None and SANDBOX_CPU_SECONDS > 0:
+            _set_cpu_limit(SANDBOX_CPU_SECONDS)
+        try:
+            if isinstance(source, str):
+                import pyarrow.feather as feather
+                stat = os.stat(source)
+                key = (source, stat.st_ino, stat.st_size)
+                if key not in frames:
+                    table = feather.read_table(source, memory_map=True)
+                    frames = {key: table.to_pandas(split_blocks=True, self_destruct=False)}
+                # Shallow copy so columns user code adds or replaces don't outlive the job
+                df = frames[key].copy(deep=False)
+            else:
+                df = source
+            result_text = execute_code(code, df)
+        except MemoryError:
+            result_text = f"Error executing code: memory limit of {SANDBOX_MEMORY_MB} MB exceeded"
+        except Exception as e:
+            result_text = f"Error loading DataFrame in sandbox: {e}"
+        conn.send(result_text)
+
+
+class SandboxWorker:
+    """One worker process and the pipe used to send it jobs."""
+
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, SANDBOX_MEMORY_MB), daemon=True, name="pandas-sandbox")
+        self.process.start()
+        child_conn.close()
+        self.jobs = 0
+        # Wait until imports are done so startup time doesn't count against the first call's timeout
+        try:
+            ready = self.conn.poll(SANDBOX_STARTUP_TIMEOUT_SECONDS) and self.conn.recv() == "ready"
+        except (EOFError, OSError):
+            ready = False
+        if not ready:
+            self.kill()
+            raise OSError(f"sandbox worker did not start (exit code {self.process.exitcode})")
+
+    @property
+    def alive(self) -> bool:
+        return self.process.is_alive()
+
+    def run(self, code: str, source, timeout: float) -> str:
+        """Blocking: send a job and wait for its result, killing the worker when it overruns."""
+        self.jobs += 1
+        try:
+            self.conn.send((code, source))
+        except OSError as e:
+            self.kill()
+            raise SandboxError(f"could not send code to the sandbox worker: {e}")
+        if not self.conn.poll(timeout):
+            self.kill()
+            raise SandboxError(f"code exceeded the {timeout}s time limit and was stopped")
+        try:
+            return self.conn.recv()
+        except (EOFError, OSError):
+            self.process.join(1)
+            if hasattr(signal, "SIGXCPU") and self.process.exitcode == -signal.SIGXCPU:
+                raise SandboxError(f"code exceeded the {SANDBOX_CPU_SECONDS}s CPU time limit and was stopped")
+            raise SandboxError(f"sandbox worker exited unexpectedly (exit code {self.process.exitcode})")
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(1)
+        self.conn.close()
+
+    def stop(self, timeout: float = 2):
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout)
+        self.kill()
+
+
+class SandboxPool:
+    """
+    Pre-started worker processes for run_pandas_code. Each call gets a whole worker so user code
+    can't block the event loop or other calls; overrunning or crashed workers are replaced.
+    """
+
+    def __init__(self, size: int = SANDBOX_WORKERS, max_jobs_per_worker: int = SANDBOX_MAX_JOBS_PER_WORKER):
+        self.size = size
+        self.max_jobs_per_worker = max_jobs_per_worker
+        # Spawned workers start from a clean interpreter instead of a copy of the server's threads and loop
+        self._context = multiprocessing.get_context("spawn")
+        # Idle workers; None is a slot whose worker will be started on demand
+        self._idle = asyncio.Queue()
+        self._workers = set()
+        self._background = set()
+
+    def _spawn(self) -> Optional[SandboxWorker]:
+        try:
+            worker = SandboxWorker(self._context)
+        except OSError as e:
+            logger.error(f"Failed to start sandbox worker: {e}")
+            return None
+        self._workers.add(worker)
+        return worker
+
+    def _discard(self, worker: SandboxWorker):
+        worker.kill()
+        self._workers.discard(worker)
+
+    async def start(self):
+        workers = await asyncio.gather(*(asyncio.to_thread(self._spawn) for _ in range(self.size)))
+        for worker in workers:
+            self._idle.put_nowait(worker)
+        logger.info(f"Started {sum(w is not None for w in workers)} sandbox workers")
+
+    async def _replace(self, old: Optional[SandboxWorker] = None):
+        if old is not None:
+            await asyncio.to_thread(old.stop)
+        self._idle.put_nowait(await asyncio.to_thread(self._spawn))
+
+    def _replace_in_background(self, old: Optional[SandboxWorker] = None):
+        task = asyncio.get_running_loop().create_task(self._replace(old))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def run(self, code: str, source) -> str:
+        """Run code against source (a Feather path to memory-map, or a DataFrame to send) in a worker."""
+        worker = await self._idle.get()
+        if worker is None or not worker.alive:
+            if worker is not None:
+                self._discard(worker)
+            worker = await asyncio.to_thread(self._spawn)
+            if worker is None:
+                self._idle.put_nowait(None)
+                return "Error executing code: could not start a sandbox worker"
+
+        try:
+            result_text = await asyncio.to_thread(worker.run, code, source, SANDBOX_TIMEOUT_SECONDS)
+        except SandboxError as e:
+            logger.warning(f"Sandbox worker stopped: {e}")
+            self._discard(worker)
+            self._replace_in_background()
+            return f"Error executing code: {e}"
+        except BaseException:
+            # Cancelled mid-call: the worker may still be busy, so it can't be reused
+            self._discard(worker)
+            self._idle.put_nowait(None)
+            raise
+
+        if worker.jobs >= self.max_jobs_per_worker:
+            self._workers.discard(worker)
+            self._replace_in_background(worker)
+        else:
+            self._idle.put_nowait(worker)
+        return result_text
+
+    async def close(self):
+        for task in list(self._background):
+            task.cancel()
+        workers, self._workers = list(self._workers), set()
+        await asyncio.gather(*(asyncio.to_thread(worker.stop) for worker in workers))
+
+
+sandbox_pool = SandboxPool()
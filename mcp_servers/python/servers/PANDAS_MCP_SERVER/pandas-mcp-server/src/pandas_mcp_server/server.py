@@ -3,9 +3,11 @@ import logging
 import pandas as pd
 from mcp.server import Server
 from mcp.types import Tool, TextContent
-from io import StringIO
-from contextlib import redirect_stdout
-import numpy as np
+from .rendering import VALUE_COUNTS_TOP_K, FORMATS, render_table, render_series, render_summary, top_k_counts
+from .dataframe_cache import dataframe_cache
+from .spill import frame_spill
+from .sandbox import sandbox_pool
+from . import streaming
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -20,7 +22,17 @@ async def list_tools() -> list[Tool]:
         Tool(
             name="summarize_dataframe",
             description="Provides a high-level summary of the dataframe, including shape, columns, data types, and the first 5 rows.",
-            inputSchema={"type": "object", "properties": {}}
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "format": {
+                        "type": "string",
+                        "enum": ["text", "markdown", "json"],
+                        "description": "Output format. 'json' is compact and machine-readable.",
+                        "default": "text"
+                    }
+                }
+            }
         ),
         Tool(
             name="get_dataframe_head",
@@ -32,6 +44,12 @@ async def list_tools() -> list[Tool]:
                         "type": "integer",
                         "description": "The number of rows to return.",
                         "default": 5
+                    },
+                    "format": {
+                        "type": "string",
+                        "enum": ["text", "markdown", "json"],
+                        "description": "Output format. 'json' is compact and machine-readable.",
+                        "default": "text"
                     }
                 }
             }
@@ -45,6 +63,12 @@ async def list_tools() -> list[Tool]:
                     "column_name": {
                         "type": "string",
                         "description": "The name of the numerical column to analyze."
+                    },
+                    "format": {
+                        "type": "string",
+                        "enum": ["text", "markdown", "json"],
+                        "description": "Output format. 'json' is compact and machine-readable.",
+                        "default": "text"
                     }
                 },
                 "required": ["column_name"]
@@ -59,6 +83,17 @@ async def list_tools() -> list[Tool]:
                     "column_name": {
                         "type": "string",
                         "description": "The name of the column to count values for."
+                    },
+                    "top_k": {
+                        "type": "integer",
+                        "description": "The number of most frequent values to list; the rest are grouped as '(other)'.",
+                        "default": VALUE_COUNTS_TOP_K
+                    },
+                    "format": {
+                        "type": "string",
+                        "enum": ["text", "markdown", "json"],
+                        "description": "Output format. 'json' is compact and machine-readable.",
+                        "default": "text"
                     }
                 },
                 "required": ["column_name"]
@@ -80,50 +115,82 @@ async def list_tools() -> list[Tool]:
         )
     ]
 
-def get_dataframe_from_credentials(credentials: dict) -> pd.DataFrame:
-    """Loads a DataFrame from a CSV URL provided in the credentials."""
+# Tools that only read the column named in their arguments
+COLUMN_TOOLS = ("get_column_statistics", "get_value_counts")
+
+def projection_for(name: str, arguments: dict):
+    """Columns a tool call needs, or None when it needs the whole frame."""
+    if name in COLUMN_TOOLS and arguments.get("column_name"):
+        return [arguments["column_name"]]
+    return None
+
+def get_dataframe_from_credentials(credentials: dict, columns: list = None) -> pd.DataFrame:
+    """Loads a DataFrame (optionally only some columns) from a CSV URL provided in the credentials."""
     csv_url = credentials.get("csv_url")
     if not csv_url:
         raise ValueError("A 'csv_url' must be provided in __credentials__.")
     try:
-        return pd.read_csv(csv_url)
+        return dataframe_cache.get(csv_url, columns)
     except Exception as e:
         raise ValueError(f"Error loading DataFrame from URL: {e}")
 
+def output_format(arguments: dict) -> str:
+    fmt = arguments.get("format", "text")
+    return fmt if fmt in FORMATS else "text"
+
+async def stream_column_tool(name: str, arguments: dict, csv_url: str):
+    """Run get_column_statistics / get_value_counts in streaming mode when the CSV is too large to load whole."""
+    if name not in COLUMN_TOOLS or not csv_url or csv_url in dataframe_cache:
+        return None
+    try:
+        if not await asyncio.to_thread(streaming.should_stream, csv_url):
+            return None
+        logger.info(f"Streaming {name} over {csv_url} in chunks of {streaming.STREAMING_CHUNK_ROWS} rows")
+        column_name = arguments.get("column_name")
+        fmt = output_format(arguments)
+        if name == "get_column_statistics":
+            stats, note = await asyncio.to_thread(streaming.column_statistics, csv_url, column_name)
+            result_text = render_series(stats, fmt)
+            return f"{result_text}\n{note}" if note and fmt != "json" else result_text
+        counts = await asyncio.to_thread(streaming.value_counts, csv_url, column_name)
+        return render_series(top_k_counts(counts, arguments.get("top_k", VALUE_COUNTS_TOP_K)), fmt)
+    except streaming.ColumnError as e:
+        return f"Error: {e}"
+    except Exception as e:
+        return f"Error loading DataFrame from URL: {e}"
+
 @app.call_tool()
 async def call_tool(name: str, arguments: dict) -> list[TextContent]:
     """Execute Pandas tools."""
     logger.info(f"Calling tool: {name} with args: {arguments}")
     __credentials__ = arguments.pop("__credentials__", {})
-    
+
+    # Large sources that aren't already in memory are aggregated chunk by chunk
+    streamed = await stream_column_tool(name, arguments, __credentials__.get("csv_url"))
+    if streamed is not None:
+        return [TextContent(type="text", text=streamed)]
+
     try:
-        df = get_dataframe_from_credentials(__credentials__)
+        df = get_dataframe_from_credentials(__credentials__, projection_for(name, arguments))
     except ValueError as e:
         return [TextContent(type="text", text=str(e))]
 
     result_text = ""
+    fmt = output_format(arguments)
 
     if name == "summarize_dataframe":
-        buffer = StringIO()
-        buffer.write(f"Shape: {df.shape}\n\n")
-        buffer.write("Columns:\n")
-        buffer.write(f"{df.columns.tolist()}\n\n")
-        buffer.write("Data Types:\n")
-        df.info(buf=buffer)
-        buffer.write("\nHead:\n")
-        buffer.write(df.head().to_string())
-        result_text = buffer.getvalue()
+        result_text = render_summary(df, fmt)
 
     elif name == "get_dataframe_head":
         n = arguments.get("n", 5)
-        result_text = df.head(n).to_string()
+        result_text = render_table(df.head(n), fmt)
 
     elif name == "get_column_statistics":
         column_name = arguments.get("column_name")
         if column_name not in df.columns:
             result_text = f"Error: Column '{column_name}' not found."
         elif pd.api.types.is_numeric_dtype(df[column_name]):
-            result_text = df[column_name].describe().to_string()
+            result_text = render_series(df[column_name].describe(), fmt)
         else:
             result_text = f"Error: Column '{column_name}' is not a numerical type."
 
@@ -132,42 +199,18 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
         if column_name not in df.columns:
             result_text = f"Error: Column '{column_name}' not found."
         else:
-            result_text = df[column_name].value_counts().to_string()
+            counts = df[column_name].value_counts()
+            result_text = render_series(top_k_counts(counts, arguments.get("top_k", VALUE_COUNTS_TOP_K)), fmt)
 
     elif name == "run_pandas_code":
         code_to_run = arguments.get("code")
         if not code_to_run:
             return [TextContent(type="text", text="No code provided to execute.")]
 
-        safe_globals = {
-            'pd': pd,
-            'np': np,
-            '__builtins__': {
-                'print': print, 'len': len, 'str': str, 'int': int, 'float': float,
-                'list': list, 'dict': dict, 'set': set, 'tuple': tuple, 'range': range,
-                'True': True, 'False': False, 'None': None
-            }
-        }
-        safe_locals = {'df': df}
-        output_buffer = StringIO()
-
-        try:
-            with redirect_stdout(output_buffer):
-                exec(code_to_run, safe_globals, safe_locals)
-            
-            printed_output = output_buffer.getvalue()
-            result_val = safe_locals.get('result')
-            
-            final_output = ""
-            if printed_output:
-                final_output += f"Output:\n{printed_output}"
-            if result_val is not None:
-                final_output += f"\nResult:\n{str(result_val)}"
-
-            result_text = final_output if final_output else "Code executed successfully with no output."
-        except Exception as e:
-            result_text = f"Error executing code: {e}"
-    
+        # Workers memory-map the spilled copy when there is one instead of receiving a pickled frame
+        source = frame_spill.data_path(__credentials__["csv_url"]) or df
+        result_text = await sandbox_pool.run(code_to_run, source)
+
     else:
         raise ValueError(f"Unknown tool: {name}")
 
@@ -178,9 +221,13 @@ async def main():
     from mcp.server.stdio import stdio_server
 
     logger.info("Starting Pandas MCP server...")
-    async with stdio_server() as (read_stream, write_stream):
-        await app.run(
-            read_stream,
-            write_stream,
-            app.create_initialization_options()
-        )
+    await sandbox_pool.start()
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await app.run(
+                read_stream,
+                write_stream,
+                app.create_initialization_options()
+            )
+    finally:
+        await sandbox_pool.close()
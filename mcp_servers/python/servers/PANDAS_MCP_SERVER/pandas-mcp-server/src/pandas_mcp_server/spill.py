@@ -0,0 +1,125 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import tempfile
+from typing import Optional
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:
+    pa = None
+    feather = None
+
+logger = logging.getLogger(__name__)
+
+SPILL_ENABLED = os.getenv("PANDAS_SPILL_ENABLED", "true").lower() == "true"
+SPILL_DIR = os.getenv("PANDAS_SPILL_DIR", os.path.join(tempfile.gettempdir(), "pandas_mcp_cache"))
+# Disk budget for spilled frames; least recently used files are removed first
+SPILL_MAX_BYTES = int(os.getenv("PANDAS_SPILL_MAX_BYTES", str(10 * 1024 * 1024 * 1024)))
+
+
+class FrameSpill:
+    """
+    Persists parsed frames as uncompressed Feather (Arrow IPC) files so restarts and sibling
+    server processes can memory-map them instead of parsing the CSV again.
+    Each frame has a JSON sidecar with the validators it was fetched with.
+    """
+
+    def __init__(self, directory: str = SPILL_DIR, max_bytes: int = SPILL_MAX_BYTES):
+        self.enabled = SPILL_ENABLED and feather is not None
+        self.directory = directory
+        self.max_bytes = max_bytes
+        if SPILL_ENABLED and feather is None:
+            logger.warning("pyarrow is not installed, on-disk DataFrame spill is disabled")
+
+    def _paths(self, url: str) -> tuple:
+        name = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.directory, name)
+        return base + ".feather", base + ".json"
+
+    def read_meta(self, url: str) -> Optional[dict]:
+        """Validators saved with the spilled frame, or None when nothing is spilled for url."""
+        if not self.enabled:
+            return None
+        data_path, meta_path = self._paths(url)
+        if not os.path.exists(data_path):
+            return None
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def data_path(self, url: str) -> Optional[str]:
+        """Path of the spilled Feather file for url, if there is one, for other processes to memory-map."""
+        if not self.enabled:
+            return None
+        data_path, _ = self._paths(url)
+        return data_path if os.path.exists(data_path) else None
+
+    def load(self, url: str) -> Optional[pd.DataFrame]:
+        if not self.enabled:
+            return None
+        data_path, _ = self._paths(url)
+        try:
+            table = feather.read_table(data_path, memory_map=True)
+            os.utime(data_path)  # mark as recently used for eviction
+            logger.info(f"Loaded spilled DataFrame for {url}")
+            return table.to_pandas()
+        except (OSError, pa.ArrowException) as e:
+            logger.warning(f"Could not load spilled DataFrame for {url}: {e}")
+            return None
+
+    def save(self, url: str, df: pd.DataFrame, meta: dict):
+        if not self.enabled:
+            return
+        data_path, meta_path = self._paths(url)
+        # Write to temp files and rename so concurrent readers never see partial files
+        tmp_data = f"{data_path}.{os.getpid()}.tmp"
+        tmp_meta = f"{meta_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            feather.write_feather(df, tmp_data, compression="uncompressed")
+            os.replace(tmp_data, data_path)
+            with open(tmp_meta, "w", encoding="utf-8") as f:
+                json.dump({**meta, "saved_at": time.time()}, f)
+            os.replace(tmp_meta, meta_path)
+        except (OSError, ValueError, TypeError, pa.ArrowException) as e:
+            logger.warning(f"Could not spill DataFrame for {url}: {e}")
+            # An older spill of url no longer matches the cached frame; sandbox workers must not read it
+            self._remove(tmp_data, tmp_meta, data_path, meta_path)
+            return
+        self.evict()
+
+    @staticmethod
+    def _remove(*paths: str):
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def evict(self):
+        """Remove least recently used spilled frames until the directory fits the budget."""
+        try:
+            files = [os.path.join(self.directory, name) for name in os.listdir(self.directory) if name.endswith(".feather")]
+            stats = [(path, os.stat(path)) for path in files]
+        except OSError:
+            return
+        total = sum(stat.st_size for _, stat in stats)
+        for path, stat in sorted(stats, key=lambda item: item[1].st_mtime):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                os.remove(path[:-len(".feather")] + ".json")
+            except OSError:
+                pass
+            total -= stat.st_size
+
+
+frame_spill = FrameSpill()
@@ -0,0 +1,150 @@
+import os
+import urllib.request
+from contextlib import contextmanager
+from typing import Optional
+import numpy as np
+import pandas as pd
+from .dataframe_cache import HTTP_TIMEOUT_SECONDS, _is_http, _local_path
+
+# Sources larger than this are aggregated chunk by chunk instead of being loaded whole
+STREAMING_THRESHOLD_BYTES = int(os.getenv("PANDAS_STREAMING_THRESHOLD_BYTES", str(256 * 1024 * 1024)))
+STREAMING_CHUNK_ROWS = int(os.getenv("PANDAS_STREAMING_CHUNK_ROWS", "100000"))
+# Rows kept in the uniform sample used for approximate quantiles
+STREAMING_SAMPLE_SIZE = int(os.getenv("PANDAS_STREAMING_SAMPLE_SIZE", "100000"))
+
+
+def source_size(url: str) -> Optional[int]:
+    """Size of the CSV in bytes, or None when it can't be determined cheaply."""
+    path = _local_path(url)
+    if path is not None:
+        return os.path.getsize(path)
+    if _is_http(url):
+        try:
+            request = urllib.request.Request(url, method="HEAD")
+            with urllib.request.urlopen(request, timeout=HTTP_TIMEOUT_SECONDS) as response:
+                length = response.headers.get("Content-Length")
+                return int(length) if length else None
+        except (OSError, ValueError):
+            return None
+    return None
+
+
+def should_stream(url: str) -> bool:
+    size = source_size(url)
+    return size is not None and size > STREAMING_THRESHOLD_BYTES
+
+
+class ColumnError(ValueError):
+    """The requested column is missing or has the wrong type; the message is shown to the caller."""
+
+
+@contextmanager
+def _open(url: str):
+    """
+    The CSV in a form pd.read_csv reads incrementally. Given an http(s) URL, pandas downloads the
+    whole body into memory before parsing, so the response is opened here and handed over as a stream.
+    """
+    if _is_http(url):
+        with urllib.request.urlopen(url, timeout=HTTP_TIMEOUT_SECONDS) as response:
+            yield response
+    else:
+        yield url
+
+
+def _iter_column(url: str, column_name: str):
+    """Chunks of one column, read in a single pass over the source."""
+    with _open(url) as source:
+        with pd.read_csv(source, usecols=lambda column: column == column_name, chunksize=STREAMING_CHUNK_ROWS) as reader:
+            for chunk in reader:
+                # The first chunk has no columns at all when the header doesn't contain column_name
+                if column_name not in chunk.columns:
+                    raise ColumnError(f"Column '{column_name}' not found.")
+                yield chunk[column_name]
+
+
+class RunningStats:
+    """Mergeable count / mean / variance / min / max plus a uniform sample for quantiles."""
+
+    def __init__(self, sample_size: int = STREAMING_SAMPLE_SIZE):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.sample_size = sample_size
+        self._sample = np.empty(0)
+        self._keys = np.empty(0)
+        self._rng = np.random.default_rng()
+
+    def update(self, values: np.ndarray):
+        n = len(values)
+        if n == 0:
+            return
+        chunk_mean = values.mean()
+        chunk_m2 = ((values - chunk_mean) ** 2).sum()
+        # Chan et al. pairwise combination of means and sums of squared deviations
+        total = self.count + n
+        delta = chunk_mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += chunk_m2 + delta ** 2 * self.count * n / total
+        self.count = total
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+
+        # Keeping the values with the smallest random keys is a uniform sample of everything seen
+        keys = self._rng.random(n)
+        sample = np.concatenate([self._sample, values])
+        sample_keys = np.concatenate([self._keys, keys])
+        if len(sample) > self.sample_size:
+            keep = np.argpartition(sample_keys, self.sample_size)[:self.sample_size]
+            sample, sample_keys = sample[keep], sample_keys[keep]
+        self._sample, self._keys = sample, sample_keys
+
+    def describe(self, name: str) -> pd.Series:
+        """Same shape as Series.describe() for a numeric column."""
+        std = np.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else np.nan
+        if self.count:
+            values = [self.mean, std, self.min, *np.quantile(self._sample, [0.25, 0.5, 0.75]), self.max]
+        else:
+            values = [np.nan] * 7
+        return pd.Series(
+            [float(self.count), *values],
+            index=["count", "mean", "std", "min", "25%", "50%", "75%", "max"],
+            name=name,
+        )
+
+    @property
+    def quantiles_exact(self) -> bool:
+        return self.count <= self.sample_size
+
+
+def column_statistics(url: str, column_name: str):
+    """
+    get_column_statistics over a CSV read in chunks; memory stays bounded by the chunk and sample sizes.
+    Returns the describe()-style Series and a note when the quantiles are approximate.
+    """
+    stats = RunningStats()
+    for series in _iter_column(url, column_name):
+        if not pd.api.types.is_numeric_dtype(series):
+            raise ColumnError(f"Column '{column_name}' is not a numerical type.")
+        stats.update(series.dropna().to_numpy(dtype="float64"))
+
+    note = None
+    if not stats.quantiles_exact:
+        note = f"(quantiles approximated from a uniform sample of {stats.sample_size} of {stats.count} rows)"
+    return stats.describe(column_name), note
+
+
+def value_counts(url: str, column_name: str) -> pd.Series:
+    """get_value_counts over a CSV read in chunks; memory grows with the number of distinct values."""
+    counts = None
+    for series in _iter_column(url, column_name):
+        chunk_counts = series.value_counts()
+        counts = chunk_counts if counts is None else counts.add(chunk_counts, fill_value=0)
+
+    if counts is None:
+        counts = pd.Series(dtype="int64", name="count")
+    counts = counts.astype("int64").sort_values(ascending=False, kind="stable")
+    counts.index.name = column_name
+    counts.name = "count"
+    return counts